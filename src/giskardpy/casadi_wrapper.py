@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import builtins
+import shutil
+from collections import OrderedDict
 from copy import copy
 from typing import Union, List
 import math
@@ -19,11 +21,61 @@ builtin_abs = builtins.abs
 _EPS = np.finfo(float).eps * 4.0
 pi = ca.pi
 
+# options for ca.Function to compile expressions to native code, ccache makes recompiling cheap across restarts
+jit_available = shutil.which('gcc') is not None
+jit_function_options = {'jit': True,
+                        'compiler': 'shell',
+                        'jit_options': {'flags': ['-O3'],
+                                        'verbose': False,
+                                        'compiler': 'ccache gcc' if shutil.which('ccache') else 'gcc'}}
+
+
+def _eliminate_common_subexpressions(expression: ca.SX) -> ca.SX:
+    """
+    Merges structurally identical subexpressions, e.g. the same fk built by several goals.
+    Only available in casadi >= 3.6, otherwise the expression is returned unchanged.
+    """
+    if not hasattr(ca, 'cse'):
+        return expression
+    try:
+        return ca.cse(expression)
+    except Exception as e:
+        logging.logwarn(f'Common subexpression elimination failed: {e}')
+        return expression
+
+
+# the most recently jit compiled functions, such that rebuilding a qp with the same structure reuses them.
+# maps a cheap signature of the function to (function without jit, jit compiled function)
+_jit_cache: OrderedDict = OrderedDict()
+_jit_cache_size = 8
+
+
+def _create_function(parameters, outputs, jit: bool = False) -> ca.Function:
+    f = ca.Function('f', parameters, outputs)
+    if jit and jit_available:
+        try:
+            signature = (f.n_instructions(), f.nnz_in(), f.nnz_out())
+            if signature in _jit_cache:
+                cached_f, cached_jit_f = _jit_cache[signature]
+                # the graphs are only serialized and compared, if the cheap signature matches
+                if cached_f.serialize() == f.serialize():
+                    _jit_cache.move_to_end(signature)
+                    return cached_jit_f
+            jit_f = ca.Function('f', parameters, outputs, jit_function_options)
+            _jit_cache[signature] = (f, jit_f)
+            _jit_cache.move_to_end(signature)
+            if len(_jit_cache) > _jit_cache_size:
+                _jit_cache.popitem(last=False)
+            return jit_f
+        except Exception as e:
+            logging.logwarn(f'Jit compilation failed, falling back to casadi\'s virtual machine: {e}')
+    return f
+
 
 class StackedCompiledFunction:
-    def __init__(self, expressions, parameters=None, additional_views=None):
+    def __init__(self, expressions, parameters=None, additional_views=None, jit=False, cse=False):
         combined_expression = vstack(expressions)
-        self.compiled_f = combined_expression.compile(parameters=parameters)
+        self.compiled_f = combined_expression.compile(parameters=parameters, jit=jit, cse=cse)
         slices = []
         start = 0
         for expression in expressions[:-1]:
@@ -42,7 +94,7 @@ class StackedCompiledFunction:
 
 
 class CompiledFunction:
-    def __init__(self, expression, parameters=None, sparse=False):
+    def __init__(self, expression, parameters=None, sparse=False, jit=False, cse=False):
         self.sparse = sparse
         if len(expression) == 0:
             self.sparse = False
@@ -52,22 +104,24 @@ class CompiledFunction:
         self.str_params = [str(x) for x in parameters]
         if len(parameters) > 0:
             parameters = [Expression(parameters).s]
+        if cse:
+            expression = Expression(_eliminate_common_subexpressions(expression.s))
 
         if self.sparse:
             expression.s = ca.sparsify(expression.s)
             try:
-                self.compiled_f = ca.Function('f', parameters, [expression.s])
+                self.compiled_f = _create_function(parameters, [expression.s], jit)
             except Exception:
-                self.compiled_f = ca.Function('f', parameters, expression.s)
+                self.compiled_f = _create_function(parameters, expression.s, jit)
             self.buf, self.f_eval = self.compiled_f.buffer()
             self.csc_indices, self.csc_indptr = expression.s.sparsity().get_ccs()
             self.out = sp.csc_matrix((np.zeros(expression.s.nnz()), self.csc_indptr, self.csc_indices))
             self.buf.set_res(0, memoryview(self.out.data))
         else:
             try:
-                self.compiled_f = ca.Function('f', parameters, [ca.densify(expression.s)])
+                self.compiled_f = _create_function(parameters, [ca.densify(expression.s)], jit)
             except Exception:
-                self.compiled_f = ca.Function('f', parameters, ca.densify(expression.s))
+                self.compiled_f = _create_function(parameters, ca.densify(expression.s), jit)
             self.buf, self.f_eval = self.compiled_f.buffer()
             if expression.shape[1] == 1:
                 shape = expression.shape[0]
@@ -149,8 +203,8 @@ class Symbol_:
         else:
             return np.array(ca.evalf(self.s))
 
-    def compile(self, parameters=None, sparse=False):
-        return CompiledFunction(self, parameters, sparse)
+    def compile(self, parameters=None, sparse=False, jit=False, cse=False):
+        return CompiledFunction(self, parameters, sparse, jit, cse)
 
 
 class Symbol(Symbol_):
@@ -1384,6 +1438,14 @@ def create_symbols(names):
     return [Symbol(x) for x in names]
 
 
+def substitute(expression, symbols, replacements):
+    """
+    Replaces symbols in expression with replacements, which can be expressions or numbers.
+    """
+    expression = Expression(expression)
+    return Expression(ca.substitute(expression.s, Expression(symbols).s, Expression(replacements).s))
+
+
 def compile_and_execute(f, params):
     input_ = []
     symbol_params = []
@@ -1555,13 +1617,13 @@ def logic_not(expr):
 
 def if_greater(a, b, if_result, else_result):
     a = Expression(a).s
-    b = Expression(b).s
+    b = _to_sx(b)
     return if_else(ca.gt(a, b), if_result, else_result)
 
 
 def if_less(a, b, if_result, else_result):
     a = Expression(a).s
-    b = Expression(b).s
+    b = _to_sx(b)
     return if_else(ca.lt(a, b), if_result, else_result)
 
 
@@ -1590,7 +1652,7 @@ def if_greater_eq(a, b, if_result, else_result):
     :return: if_result if a >= b else else_result
     """
     a = Expression(a).s
-    b = Expression(b).s
+    b = _to_sx(b)
     return if_else(ca.ge(a, b), if_result, else_result)
 
 
@@ -1610,7 +1672,7 @@ def if_eq_zero(condition, if_result, else_result):
 
 def if_eq(a, b, if_result, else_result):
     a = Expression(a).s
-    b = Expression(b).s
+    b = _to_sx(b)
     return if_else(ca.eq(a, b), if_result, else_result)
 
 
@@ -34,6 +34,8 @@ class QPControllerConfig:
     retries_with_relaxed_constraints: int = 5
     added_slack: float = 100
     weight_factor: float = 100
+    jit: bool = False
+    cse: bool = False
 
     def __init__(self,
                  qp_solver: Optional[SupportedQPSolver] = None,
@@ -42,7 +44,9 @@ class QPControllerConfig:
                  max_trajectory_length: Optional[float] = 30,
                  retries_with_relaxed_constraints: int = 5,
                  added_slack: float = 100,
-                 weight_factor: float = 100):
+                 weight_factor: float = 100,
+                 jit: bool = False,
+                 cse: bool = False):
         """
         :param qp_solver: if not set, Giskard will search for the fasted installed solver.
         :param prediction_horizon: Giskard uses MPC and this is the length of the horizon. You usually don't need to change this.
@@ -52,6 +56,11 @@ class QPControllerConfig:
         :param retries_with_relaxed_constraints: don't change, only for the pros.
         :param added_slack: don't change, only for the pros.
         :param weight_factor: don't change, only for the pros.
+        :param jit: compiles the qp matrices to native code, which makes each control cycle faster, but creating
+                    the controller slower. Needs gcc, ccache is used if available.
+        :param cse: merges identical subexpressions of the qp matrices, e.g. the same fk used by several goals, before
+                    compiling them. Makes each control cycle cheaper, but creating the controller slower.
+                    Needs casadi >= 3.6.
         """
         self.__qp_solver = qp_solver
         if prediction_horizon < 7:
@@ -62,6 +71,8 @@ class QPControllerConfig:
         self.__retries_with_relaxed_constraints = retries_with_relaxed_constraints
         self.__added_slack = added_slack
         self.__weight_factor = weight_factor
+        self.__jit = jit
+        self.__cse = cse
         self.__endless_mode = self.__max_trajectory_length is None
         self.set_defaults()
 
@@ -72,6 +83,8 @@ class QPControllerConfig:
         self.retries_with_relaxed_constraints = self.__retries_with_relaxed_constraints
         self.added_slack = self.__added_slack
         self.weight_factor = self.__weight_factor
+        self.jit = self.__jit
+        self.cse = self.__cse
         self.endless_mode = self.__endless_mode
         self.max_trajectory_length = self.__max_trajectory_length
 
@@ -16,6 +16,7 @@ from giskardpy.model.links import Link
 from giskardpy.model.utils import robot_name_from_urdf_string
 from giskardpy.model.world import WorldTree
 from giskardpy.my_types import my_string, PrefixName, Derivatives, derivative_map
+from giskardpy.utils.decorators import clear_memo
 
 
 class WorldConfig(ABC):
@@ -84,6 +85,9 @@ class WorldConfig(ABC):
         for derivative, limit in limit_map.items():
             free_variable.set_lower_limit(derivative, -limit)
             free_variable.set_upper_limit(derivative, limit)
+        free_variable.reset_cache()
+        clear_memo(self.world.compute_joint_limits)
+        clear_memo(self.world.is_joint_continuous)
 
     def set_default_color(self, r: float, g: float, b: float, a: float):
         """
@@ -94,6 +98,14 @@ class WorldConfig(ABC):
         """
         self.world.default_link_color = ColorRGBA(r, g, b, a)
 
+    def compile_fks_to_native_code(self, enabled: bool = True):
+        """
+        Forward kinematics of all links are computed once per control cycle. If enabled, the function that does that
+        is compiled with gcc instead of being interpreted by casadi. Every change of the world model will trigger
+        a recompile, which is cheap if ccache is installed.
+        """
+        self.world.jit_fks = enabled
+
     def set_default_limits(self, new_limits: derivative_map):
         """
         The default values will be set automatically, even if this function is not called.
@@ -124,7 +136,9 @@ class WorldConfig(ABC):
         :param parameter_name:
         :param group_name: How to call the robot. If nothing is specified it will get the name it has in the urdf
         """
-        urdf = rospy.get_param(parameter_name)
+        # the urdf is large and usually requested again whenever a giskard instance is created in this process,
+        # the cached version only transfers it again if it changed
+        urdf = rospy.get_param_cached(parameter_name)
         return self.add_robot_urdf(urdf=urdf, group_name=group_name)
 
     def add_fixed_joint(self, parent_link: my_string, child_link: my_string,
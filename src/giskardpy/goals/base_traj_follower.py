@@ -32,25 +32,24 @@ class BaseTrajFollower(Goal):
         self.base_footprint_link = self.joint.child_link_name
         self.track_only_velocity = track_only_velocity
 
-    @profile
-    def x_symbol(self, t: int, free_variable_name: PrefixName, derivative: Derivatives = Derivatives.position) \
-            -> w.Symbol:
-        return self.god_map.to_symbol(identifier.trajectory + ['get_exact', (t,), free_variable_name, derivative])
-
     @profile
     def current_traj_point(self, free_variable_name: PrefixName, start_t: float,
                            derivative: Derivatives = Derivatives.position) \
-            -> w.Expression:
-        time = self.god_map.to_expr(identifier.time)
-        b_result_cases = []
-        for t in range(self.trajectory_length):
-            b = t * self.sample_period
-            eq_result = self.x_symbol(t, free_variable_name, derivative)
-            b_result_cases.append((b, eq_result))
-            # FIXME if less eq cases behavior changed
-        return w.if_less_eq_cases(a=time + start_t,
-                                  b_result_cases=b_result_cases,
-                                  else_result=self.x_symbol(self.trajectory_length - 1, free_variable_name, derivative))
+            -> w.Symbol:
+        """
+        Symbol that refers to the trajectory point at time + start_t.
+        The point is looked up by traj_point_at_time each cycle, instead of selecting it with one symbolic case
+        per trajectory point.
+        """
+        return self.god_map.to_symbol(self._get_identifier() + ['traj_point_at_time',
+                                                                (free_variable_name, start_t, derivative)])
+
+    def traj_point_at_time(self, free_variable_name: PrefixName, start_t: float, derivative: Derivatives) -> float:
+        time = self.god_map.unsafe_get_data(identifier.time)
+        # index of the first trajectory point with time + start_t <= t * sample_period, or the last one.
+        t = min(int(np.searchsorted(self.trajectory_times, time + start_t, side='left')), self.trajectory_length - 1)
+        trajectory = self.god_map.unsafe_get_data(identifier.trajectory)
+        return trajectory.get_exact(t)[free_variable_name][derivative]
 
     @profile
     def make_odom_T_base_footprint_goal(self, t_in_s: float, derivative: Derivatives = Derivatives.position):
@@ -86,10 +85,11 @@ class BaseTrajFollower(Goal):
         errors_x = []
         errors_y = []
         map_T_base_footprint = self.get_fk(self.world.root_link_name, self.base_footprint_link)
+        sample_period = self.sample_period
         for t in range(self.prediction_horizon):
-            x = self.current_traj_point(self.joint.x_vel.name, t * self.sample_period, Derivatives.velocity)
+            x = self.current_traj_point(self.joint.x_vel.name, t * sample_period, Derivatives.velocity)
             if isinstance(self.joint, OmniDrive):
-                y = self.current_traj_point(self.joint.y_vel.name, t * self.sample_period, Derivatives.velocity)
+                y = self.current_traj_point(self.joint.y_vel.name, t * sample_period, Derivatives.velocity)
             else:
                 y = 0
             base_footprint_P_vel = w.Vector3((x, y, 0))
@@ -131,8 +131,9 @@ class BaseTrajFollower(Goal):
     @profile
     def add_rot_constraints(self):
         errors = []
+        sample_period = self.sample_period
         for t in range(self.prediction_horizon):
-            errors.append(self.current_traj_point(self.joint.yaw.name, t * self.sample_period, Derivatives.velocity))
+            errors.append(self.current_traj_point(self.joint.yaw.name, t * sample_period, Derivatives.velocity))
             if t == 0 and not self.track_only_velocity:
                 errors[-1] += self.rot_error_at(t)
         self.add_velocity_constraint(lower_velocity_limit=errors,
@@ -146,6 +147,7 @@ class BaseTrajFollower(Goal):
     def make_constraints(self):
         trajectory = self.god_map.get_data(identifier.trajectory)
         self.trajectory_length = len(trajectory.items())
+        self.trajectory_times = np.arange(self.trajectory_length) * self.sample_period
         self.add_trans_constraints()
         self.add_rot_constraints()
 
@@ -609,7 +611,6 @@ class CarryMyBullshit(Goal):
         root_P_closest_point = w.Point3([closest_x, closest_y, 0])
         # tangent = root_P_goal_point - root_P_closest_point
         # root_V_tangent = w.Vector3([tangent.x, tangent.y, 0])
-        tip_V_pointing_axis = w.Vector3(self.tip_V_pointing_axis)
 
         # %% orient to goal
         _, _, map_odom_angle = root_T_odom.to_rotation().to_rpy()
@@ -625,8 +626,6 @@ class CarryMyBullshit(Goal):
             root_V_goal_axis = map_P_human_projected - root_P_tip
         distance_to_human = w.norm(root_V_goal_axis)
         root_V_goal_axis.scale(1)
-        root_V_pointing_axis = root_T_bf.dot(tip_V_pointing_axis)
-        root_V_pointing_axis.vis_frame = self.tip
         root_V_goal_axis.vis_frame = self.tip
         map_goal_angle = w.angle_between_vector(w.Vector3([1, 0, 0]), root_V_goal_axis)
         map_goal_angle = w.if_greater(root_V_goal_axis.y, 0, map_goal_angle, -map_goal_angle)
@@ -736,10 +735,11 @@ class CarryMyBullshit(Goal):
             # bf_P_laser_avoidance = w.Point3([self.laser_distance_threshold + closest_laser_reading, 0, 0])
             # bf_P_laser_avoidance.reference_frame = self.world.search_for_link_name(self.laser_frame)
             # self.add_debug_expr('center', bf_P_laser_avoidance)
-            bf_V_laser_avoidance_direction = w.Vector3([0, sideways_vel, 0])
-            map_V_laser_avoidance_direction = root_T_bf.dot(bf_V_laser_avoidance_direction)
-            map_V_laser_avoidance_direction.vis_frame = self.world.search_for_link_name(self.laser_frame)
-            self.add_debug_expr('base_V_laser_avoidance_direction', map_V_laser_avoidance_direction)
+            if self.debug_expressions_enabled:
+                bf_V_laser_avoidance_direction = w.Vector3([0, sideways_vel, 0])
+                map_V_laser_avoidance_direction = root_T_bf.dot(bf_V_laser_avoidance_direction)
+                map_V_laser_avoidance_direction.vis_frame = self.world.search_for_link_name(self.laser_frame)
+                self.add_debug_expr('base_V_laser_avoidance_direction', map_V_laser_avoidance_direction)
             odom_y_vel = self.odom_joint.y_vel.get_symbol(Derivatives.position)
 
             laser_avoidance_weight = w.if_else(w.less(distance_to_closest_point, self.traj_tracking_radius),
@@ -771,25 +771,30 @@ class BaseTrajFollowerPR2(BaseTrajFollower):
         self.world.state[self.joint.yaw1_vel.name].position = 0
         map_T_current = self.get_fk(self.world.root_link_name, self.base_footprint_link)
         map_P_current = map_T_current.to_position()
-        self.add_debug_expr(f'map_P_current.x', map_P_current.x)
-        self.add_debug_expr('time', self.god_map.to_expr(identifier.time))
+        debug_expressions_enabled = self.debug_expressions_enabled
+        if debug_expressions_enabled:
+            self.add_debug_expr(f'map_P_current.x', map_P_current.x)
+            self.add_debug_expr('time', self.god_map.to_expr(identifier.time))
+        sample_period = self.sample_period
+        weight = self.weight
+        reference_velocity = self.joint.translation_limits[Derivatives.velocity]
         for t in range(self.prediction_horizon - 2):
-            trajectory_time_in_s = t * self.sample_period
+            trajectory_time_in_s = t * sample_period
             map_P_goal = self.make_map_T_base_footprint_goal(trajectory_time_in_s).to_position()
             map_V_error = (map_P_goal - map_P_current)
-            self.add_debug_expr(f'map_P_goal.x/{t}', map_P_goal.x)
-            self.add_debug_expr(f'map_V_error.x/{t}', map_V_error.x)
-            self.add_debug_expr(f'map_V_error.y/{t}', map_V_error.y)
-            weight = self.weight
+            if debug_expressions_enabled:
+                self.add_debug_expr(f'map_P_goal.x/{t}', map_P_goal.x, track_velocity=False)
+                self.add_debug_expr(f'map_V_error.x/{t}', map_V_error.x, track_velocity=False)
+                self.add_debug_expr(f'map_V_error.y/{t}', map_V_error.y, track_velocity=False)
             if t < 100:
-                self.add_constraint(reference_velocity=self.joint.translation_limits[Derivatives.velocity],
+                self.add_constraint(reference_velocity=reference_velocity,
                                     lower_error=map_V_error.x,
                                     upper_error=map_V_error.x,
                                     weight=weight,
                                     task_expression=map_P_current.x,
                                     name=f'base/x/{t:02d}',
                                     control_horizon=t + 1)
-                self.add_constraint(reference_velocity=self.joint.translation_limits[Derivatives.velocity],
+                self.add_constraint(reference_velocity=reference_velocity,
                                     lower_error=map_V_error.y,
                                     upper_error=map_V_error.y,
                                     weight=weight,
@@ -802,7 +807,7 @@ class BaseTrajFollowerPR2(BaseTrajFollower):
             #     lb_yaw1[-1] += self.rot_error_at(t)
             #     yaw1_goal_position = self.current_traj_point(self.joint.yaw1_vel.name, trajectory_time_in_s,
             #                                                  Derivatives.position)
-            forward = self.current_traj_point(self.joint.forward_vel.name, t * self.sample_period,
+            forward = self.current_traj_point(self.joint.forward_vel.name, trajectory_time_in_s,
                                               Derivatives.velocity) * 1.1
             lb_forward.append(forward)
         weight_vel = WEIGHT_ABOVE_CA
@@ -811,15 +816,16 @@ class BaseTrajFollowerPR2(BaseTrajFollower):
         lba_forward = lb_forward
         uba_forward = lb_forward
 
-        yaw1 = self.joint.yaw1_vel.get_symbol(Derivatives.position)
-        yaw2 = self.joint.yaw.get_symbol(Derivatives.position)
-        bf_yaw = yaw1 - yaw2
-        x = w.cos(bf_yaw)
-        y = w.sin(bf_yaw)
-        v = w.Vector3([x, y, 0])
-        v.vis_frame = 'pr2/base_footprint'
-        v.reference_frame = 'pr2/base_footprint'
-        self.add_debug_expr('v', v)
+        if debug_expressions_enabled:
+            yaw1 = self.joint.yaw1_vel.get_symbol(Derivatives.position)
+            yaw2 = self.joint.yaw.get_symbol(Derivatives.position)
+            bf_yaw = yaw1 - yaw2
+            x = w.cos(bf_yaw)
+            y = w.sin(bf_yaw)
+            v = w.Vector3([x, y, 0])
+            v.vis_frame = 'pr2/base_footprint'
+            v.reference_frame = 'pr2/base_footprint'
+            self.add_debug_expr('v', v)
 
         # self.add_velocity_constraint(lower_velocity_limit=lba_yaw,
         #                              upper_velocity_limit=uba_yaw,
@@ -5,7 +5,6 @@ from typing import Optional
 import numpy as np
 from geometry_msgs.msg import PointStamped, PoseStamped, QuaternionStamped
 from geometry_msgs.msg import Vector3Stamped
-from tf.transformations import rotation_from_matrix
 
 from giskardpy import casadi_wrapper as w
 from giskardpy.goals.goal import Goal, WEIGHT_ABOVE_CA, WEIGHT_BELOW_CA
@@ -169,8 +168,9 @@ class CartesianPositionStraight(Goal):
 
     def make_constraints(self):
         root_P_goal = w.Point3(self.goal_point)
-        root_P_tip = self.get_fk(self.root_link, self.tip_link).to_position()
-        t_T_r = self.get_fk(self.tip_link, self.root_link)
+        root_T_tip = self.get_fk(self.root_link, self.tip_link)
+        root_P_tip = root_T_tip.to_position()
+        t_T_r = root_T_tip.inverse()
         tip_P_goal = t_T_r.dot(root_P_goal)
 
         # Create rotation matrix, which rotates the tip link frame
@@ -181,17 +181,17 @@ class CartesianPositionStraight(Goal):
         trans_error = tip_V_error.norm()
         # x-axis
         tip_V_intermediate_error = w.save_division(tip_V_error, trans_error)
-        # y- and z-axis
-        tip_V_intermediate_y = w.Vector3(np.random.random((3,)))
-        tip_V_intermediate_y.scale(1)
+        # y- and z-axis, built from whichever of the tip's x- or y-axis is less parallel to the error
+        tip_V_intermediate_y = w.if_greater(w.abs(tip_V_intermediate_error.x), 0.9,
+                                            w.Vector3((0, 1, 0)),
+                                            w.Vector3((1, 0, 0)))
         y = tip_V_intermediate_error.cross(tip_V_intermediate_y)
         z = tip_V_intermediate_error.cross(y)
         t_R_a = w.RotationMatrix.from_vectors(x=tip_V_intermediate_error, y=-z, z=y)
 
         # Apply rotation matrix on the fk of the tip link
         a_T_t = t_R_a.inverse().dot(
-            self.get_fk_evaluated(self.tip_link, self.root_link)).dot(
-            self.get_fk(self.root_link, self.tip_link))
+            self.get_fk_evaluated(self.tip_link, self.root_link)).dot(root_T_tip)
         expr_p = a_T_t.to_position()
         dist = w.norm(root_P_goal - root_P_tip)
 
@@ -244,36 +244,48 @@ class CartesianPose(Goal):
         :param weight: default WEIGHT_ABOVE_CA
         :param root_link2: experimental, don't use
         """
-        self.root_link = root_link
-        self.tip_link = tip_link
         super().__init__()
-        goal_point = PointStamped()
-        goal_point.header = goal_pose.header
-        goal_point.point = goal_pose.pose.position
-        self.add_constraints_of_goal(CartesianPosition(root_link=root_link,
-                                                       root_group=root_group,
-                                                       tip_link=tip_link,
-                                                       tip_group=tip_group,
-                                                       goal_point=goal_point,
-                                                       max_velocity=max_linear_velocity,
-                                                       reference_velocity=reference_linear_velocity,
-                                                       weight=weight,
-                                                       root_link2=root_link2))
-        goal_orientation = QuaternionStamped()
-        goal_orientation.header = goal_pose.header
-        goal_orientation.quaternion = goal_pose.pose.orientation
-        self.add_constraints_of_goal(CartesianOrientation(root_link=root_link,
-                                                          root_group=root_group,
-                                                          tip_link=tip_link,
-                                                          tip_group=tip_group,
-                                                          goal_orientation=goal_orientation,
-                                                          max_velocity=max_angular_velocity,
-                                                          reference_velocity=reference_angular_velocity,
-                                                          weight=weight,
-                                                          root_link2=root_link2))
+        if reference_linear_velocity is None:
+            reference_linear_velocity = 0.2
+        if reference_angular_velocity is None:
+            reference_angular_velocity = max_angular_velocity
+        if reference_angular_velocity is None:
+            reference_angular_velocity = 0.5
+        self.root_link = self.world.search_for_link_name(root_link, root_group)
+        self.tip_link = self.world.search_for_link_name(tip_link, tip_group)
+        if root_link2 is not None:
+            self.root_link2 = self.world.search_for_link_name(root_link2, root_group)
+            self.goal_pose = self.transform_msg(self.root_link2, goal_pose)
+        else:
+            self.root_link2 = None
+            self.goal_pose = self.transform_msg(self.root_link, goal_pose)
+        self.reference_linear_velocity = reference_linear_velocity
+        self.reference_angular_velocity = reference_angular_velocity
+        self.weight = weight
+        if max_linear_velocity is not None:
+            self.add_constraints_of_goal(TranslationVelocityLimit(root_link=root_link,
+                                                                  root_group=root_group,
+                                                                  tip_link=tip_link,
+                                                                  tip_group=tip_group,
+                                                                  weight=weight,
+                                                                  max_velocity=max_linear_velocity,
+                                                                  hard=False))
 
     def make_constraints(self):
-        pass
+        r_T_g = w.TransMatrix(self.goal_pose)
+        r_T_c = self.get_fk(self.root_link, self.tip_link)
+        if self.root_link2 is not None:
+            c_R_r_eval = self.get_fk_evaluated(self.tip_link, self.root_link2).to_rotation()
+            root_link2_T_root_link = self.get_fk_evaluated(self.root_link2, self.root_link)
+            r_T_c = root_link2_T_root_link.dot(r_T_c)
+        else:
+            c_R_r_eval = self.get_fk_evaluated(self.tip_link, self.root_link).to_rotation()
+        self.add_pose_goal_constraints(frame_T_current=r_T_c,
+                                       frame_T_goal=r_T_g,
+                                       current_R_frame_eval=c_R_r_eval,
+                                       reference_linear_velocity=self.reference_linear_velocity,
+                                       reference_angular_velocity=self.reference_angular_velocity,
+                                       weight=self.weight)
 
     def __str__(self):
         s = super().__str__()
@@ -313,7 +325,7 @@ class DiffDriveBaseGoal(Goal):
         self.base_footprint = self.world.search_for_link_name(tip_link, tip_group)
         self.goal_pose = self.transform_msg(self.map, goal_pose)
         self.goal_pose.pose.position.z = 0
-        diff_drive_joints = [v for k, v in self.world.joints.items() if isinstance(v, DiffDrive)]
+        diff_drive_joints = self.world.get_joints_of_type(DiffDrive)
         assert len(diff_drive_joints) == 1
         self.joint: DiffDrive = diff_drive_joints[0]
         self.odom = self.joint.parent_link_name
@@ -329,7 +341,8 @@ class DiffDriveBaseGoal(Goal):
     def make_constraints(self):
         map_T_base_current = w.TransMatrix(self.world.compute_fk_np(self.map, self.base_footprint))
         map_T_odom_current = self.world.compute_fk_np(self.map, self.odom)
-        map_odom_angle, _, _ = rotation_from_matrix(map_T_odom_current)
+        # odom is only rotated around z relative to map
+        map_odom_angle = np.arctan2(map_T_odom_current[1, 0], map_T_odom_current[0, 0])
         map_R_base_current = map_T_base_current.to_rotation()
         axis_start, angle_start = map_R_base_current.to_axis_angle()
         angle_start = w.if_greater_zero(axis_start[2], angle_start, -angle_start)
@@ -364,16 +377,13 @@ class DiffDriveBaseGoal(Goal):
         middle_angle = w.normalize_angle(
             map_goal_angle2 + w.shortest_angular_distance(map_goal_angle2, angle_start) / 2)
 
-        middle_angle = self.god_map.evaluate_expr(middle_angle)
-        a = self.god_map.evaluate_expr(w.shortest_angular_distance(map_goal_angle_direction_f, middle_angle))
-        b = self.god_map.evaluate_expr(w.shortest_angular_distance(map_goal_angle_direction_b, middle_angle))
+        a, b = self.god_map.evaluate_exprs([w.shortest_angular_distance(map_goal_angle_direction_f, middle_angle),
+                                            w.shortest_angular_distance(map_goal_angle_direction_b, middle_angle)])
         eps = 0.01
-        if self.always_forward:
+        if self.always_forward or abs(a) - abs(b) <= 0.03:
             map_goal_angle1 = map_goal_angle_direction_f
         else:
-            map_goal_angle1 = w.if_less_eq(w.abs(a) - w.abs(b), 0.03,
-                                           if_result=map_goal_angle_direction_f,
-                                           else_result=map_goal_angle_direction_b)
+            map_goal_angle1 = map_goal_angle_direction_b
         rotate_to_goal_error = w.shortest_angular_distance(map_current_angle, map_goal_angle1)
 
         weight_final_rotation = w.if_else(w.logic_and(w.less_equal(w.abs(distance), eps * 2),
@@ -418,19 +428,13 @@ class PR2DiffDriveBaseGoal(Goal):
         super().__init__()
         self.max_angular_velocity = max_angular_velocity
         self.max_linear_velocity = max_linear_velocity
-        diff_drive_joints = [v for k, v in self.world.joints.items() if isinstance(v, OmniDrivePR22)]
+        diff_drive_joints = self.world.get_joints_of_type(OmniDrivePR22)
         assert len(diff_drive_joints) == 1
         self.joint: OmniDrivePR22 = diff_drive_joints[0]
         self.weight = weight
         self.root_link = self.joint.parent_link_name
         self.tip_link = self.joint.child_link_name
         self.root_T_goal = self.transform_msg(self.root_link, goal_pose)
-        self.add_constraints_of_goal(CartesianPose(root_link=self.root_link,
-                                                   tip_link=self.tip_link,
-                                                   goal_pose=goal_pose,
-                                                   reference_linear_velocity=self.max_linear_velocity,
-                                                   reference_angular_velocity=self.max_angular_velocity,
-                                                   weight=WEIGHT_BELOW_CA))
 
     def make_constraints(self):
         root_T_tip = self.get_fk(self.root_link, self.tip_link)
@@ -444,20 +448,30 @@ class PR2DiffDriveBaseGoal(Goal):
         root_V_forward.vis_frame = self.tip_link
 
         root_V_goal = root_P_goal - root_P_tip
-        root_V_goal.scale(1)
+        distance_to_goal = root_V_goal.norm()
+        root_V_goal = w.save_division(root_V_goal, distance_to_goal)
         root_V_goal.vis_frame = self.tip_link
 
-        self.add_debug_expr('root_P_goal', root_P_goal)
-        self.add_debug_expr('root_V_forward', root_V_forward)
-        self.add_debug_expr('root_V_goal', root_V_goal)
+        self.add_debug_expr('root_P_goal', root_P_goal, track_velocity=False)
+        self.add_debug_expr('root_V_forward', root_V_forward, track_velocity=False)
+        self.add_debug_expr('root_V_goal', root_V_goal, track_velocity=False)
 
-        weight = w.if_greater(w.norm(root_P_goal - root_P_tip), 0.005, WEIGHT_ABOVE_CA, 0)
+        weight = w.if_greater(distance_to_goal, 0.005, WEIGHT_ABOVE_CA, 0)
 
         self.add_vector_goal_constraints(frame_V_current=root_V_forward,
                                          frame_V_goal=root_V_goal,
                                          reference_velocity=self.max_angular_velocity,
                                          weight=weight,
                                          name='angle')
+        # same as a CartesianPose from root_link to tip_link, but sharing the fk and goal of this goal
+        self.add_pose_goal_constraints(frame_T_current=root_T_tip,
+                                       frame_T_goal=root_T_goal,
+                                       current_R_frame_eval=self.get_fk_evaluated(self.tip_link,
+                                                                                  self.root_link).to_rotation(),
+                                       reference_linear_velocity=self.max_linear_velocity,
+                                       reference_angular_velocity=self.max_angular_velocity,
+                                       weight=WEIGHT_BELOW_CA,
+                                       name='pose')
 
     def __str__(self) -> str:
         return super().__str__()
@@ -145,9 +145,6 @@ class KeepHandInWorkspace(Goal):
         map_T_base_footprint = self.get_fk(self.map_frame, self.base_footprint)
         map_V_pointing_axis = w.dot(map_T_base_footprint, base_footprint_V_pointing_axis)
         map_T_tip = self.get_fk(self.map_frame, self.tip_link)
-        map_V_tip = w.Vector3(map_T_tip.to_position())
-        map_V_tip.y = 0
-        map_V_tip.z = 0
         map_P_tip = map_T_tip.to_position()
         map_P_tip.z = 0
         map_P_base_footprint = map_T_base_footprint.to_position()
@@ -155,7 +152,6 @@ class KeepHandInWorkspace(Goal):
         base_footprint_V_tip = map_P_tip - map_P_base_footprint
         # distance_to_base = w.norm(base_footprint_V_tip)
 
-        map_V_tip.scale(1)
         angle_error = w.angle_between_vector(base_footprint_V_tip, map_V_pointing_axis)
         # self.add_debug_expr('rot', angle_error)
         self.add_inequality_constraint(reference_velocity=0.5,
@@ -205,7 +201,7 @@ class PR2DiffDriveOrient(Goal):
         super().__init__()
         self.max_angular_velocity = max_angular_velocity
         self.max_linear_velocity = max_linear_velocity
-        diff_drive_joints = [v for k, v in self.world.joints.items() if isinstance(v, OmniDrivePR22)]
+        diff_drive_joints = self.world.get_joints_of_type(OmniDrivePR22)
         assert len(diff_drive_joints) == 1
         self.joint: OmniDrivePR22 = diff_drive_joints[0]
         self.weight = weight
@@ -228,8 +224,8 @@ class PR2DiffDriveOrient(Goal):
         root_V_forward = w.Vector3((w.cos(root_yaw1), w.sin(root_yaw1), 0))
         root_V_forward.vis_frame = self.base_tip_link
 
-        self.add_debug_expr('root_V_forward', root_V_forward)
-        self.add_debug_expr('base_root_V_eef_vel', base_root_V_eef_vel)
+        self.add_debug_expr('root_V_forward', root_V_forward, track_velocity=False)
+        self.add_debug_expr('base_root_V_eef_vel', base_root_V_eef_vel, track_velocity=False)
 
         weight = w.if_greater(velocity_magnitude_mps, 0.01, self.weight, 0)
 
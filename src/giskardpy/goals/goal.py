@@ -3,7 +3,9 @@ from __future__ import annotations
 import abc
 from abc import ABC
 from collections import OrderedDict
-from typing import Optional, Tuple, Dict, List, Union, Callable, TYPE_CHECKING
+from typing import Optional, Tuple, Dict, List, Union, Callable, Set, TYPE_CHECKING
+
+import numpy as np
 
 from giskardpy.god_map_user import GodMapWorshipper
 
@@ -31,6 +33,7 @@ WEIGHT_MIN = Constraint_msg.WEIGHT_MIN
 
 class Goal(GodMapWorshipper, ABC):
     _sub_goals: List[Goal]
+    _debug_expressions_with_velocity: Set[str]
 
     @abc.abstractmethod
     def __init__(self):
@@ -157,7 +160,7 @@ class Goal(GodMapWorshipper, ABC):
         Return the homogeneous transformation matrix root_T_tip. This Matrix refers to the evaluated current transform.
         This means that the derivative towards the joint symbols will be 0.
         """
-        result: w.TransMatrix = self.god_map.list_to_frame(identifier.fk_np + [(root, tip)])
+        result: w.TransMatrix = self.world.compose_fk_evaluated_expression(root, tip)
         result.reference_frame = root
         result.child_frame = tip
         return result
@@ -223,6 +226,7 @@ class Goal(GodMapWorshipper, ABC):
         self._inequality_constraints = OrderedDict()
         self._derivative_constraints = OrderedDict()
         self._debug_expressions = OrderedDict()
+        self._debug_expressions_with_velocity = set()
 
         for sub_goal in self._sub_goals:
             sub_goal._save_self_on_god_map()
@@ -233,6 +237,8 @@ class Goal(GodMapWorshipper, ABC):
             self._inequality_constraints.update(_prepend_prefix(self.__class__.__name__, inequality_constraints))
             self._derivative_constraints.update(_prepend_prefix(self.__class__.__name__, derivative_constraints))
             self._debug_expressions.update(_prepend_prefix(self.__class__.__name__, debug_expressions))
+            self._debug_expressions_with_velocity.update(f'{self.__class__.__name__}/{name}'
+                                                         for name in sub_goal._debug_expressions_with_velocity)
 
         self.make_constraints()
         return self._equality_constraints, self._inequality_constraints, self._derivative_constraints, \
@@ -433,19 +439,27 @@ class Goal(GodMapWorshipper, ABC):
 
     def add_inequality_constraint_vector(self,
                                          reference_velocities: Union[
-                                             w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float]],
+                                             w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float], np.ndarray],
                                          lower_errors: Union[
-                                             w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float]],
+                                             w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float], np.ndarray],
                                          upper_errors: Union[
-                                             w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float]],
-                                         weights: Union[w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float]],
+                                             w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float], np.ndarray],
+                                         weights: Union[w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float],
+                                                        np.ndarray],
                                          task_expression: Union[w.Expression, w.Vector3, w.Point3, List[w.symbol_expr]],
                                          names: List[str],
                                          lower_slack_limits: Optional[List[w.symbol_expr_float]] = None,
                                          upper_slack_limits: Optional[List[w.symbol_expr_float]] = None):
         """
         Calls add_constraint for a list of expressions.
-        """
+        Numerical parameters can also be passed as numpy arrays.
+        """
+        reference_velocities = _numpy_to_list(reference_velocities)
+        lower_errors = _numpy_to_list(lower_errors)
+        upper_errors = _numpy_to_list(upper_errors)
+        weights = _numpy_to_list(weights)
+        lower_slack_limits = _numpy_to_list(lower_slack_limits)
+        upper_slack_limits = _numpy_to_list(upper_slack_limits)
         if len(lower_errors) != len(upper_errors) \
                 or len(lower_errors) != len(task_expression) \
                 or len(lower_errors) != len(reference_velocities) \
@@ -469,17 +483,24 @@ class Goal(GodMapWorshipper, ABC):
 
     def add_equality_constraint_vector(self,
                                        reference_velocities: Union[
-                                           w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float]],
+                                           w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float], np.ndarray],
                                        equality_bounds: Union[
-                                           w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float]],
-                                       weights: Union[w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float]],
+                                           w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float], np.ndarray],
+                                       weights: Union[w.Expression, w.Vector3, w.Point3, List[w.symbol_expr_float],
+                                                      np.ndarray],
                                        task_expression: Union[w.Expression, w.Vector3, w.Point3, List[w.symbol_expr]],
                                        names: List[str],
                                        lower_slack_limits: Optional[List[w.symbol_expr_float]] = None,
                                        upper_slack_limits: Optional[List[w.symbol_expr_float]] = None):
         """
         Calls add_constraint for a list of expressions.
+        Numerical parameters can also be passed as numpy arrays.
         """
+        reference_velocities = _numpy_to_list(reference_velocities)
+        equality_bounds = _numpy_to_list(equality_bounds)
+        weights = _numpy_to_list(weights)
+        lower_slack_limits = _numpy_to_list(lower_slack_limits)
+        upper_slack_limits = _numpy_to_list(upper_slack_limits)
         for i in range(len(equality_bounds)):
             name_suffix = names[i] if names else None
             lower_slack_limit = lower_slack_limits[i] if lower_slack_limits else None
@@ -492,17 +513,30 @@ class Goal(GodMapWorshipper, ABC):
                                          lower_slack_limit=lower_slack_limit,
                                          upper_slack_limit=upper_slack_limit)
 
-    def add_debug_expr(self, name: str, expr: w.all_expressions_float):
+    def add_debug_expr(self, name: str, expr: w.all_expressions_float, track_velocity: bool = True):
         """
         Add any expression for debug purposes. They will be evaluated as well and can be plotted by activating
         the debug plotter in this Giskard config.
         :param name:
         :param expr:
+        :param track_velocity: if True, the debug plotter also plots the velocity of this expression.
         """
+        if not self.debug_expressions_enabled:
+            return
         name = f'{self}/{name}'
         if not isinstance(expr, w.Symbol_):
             expr = w.Expression(expr)
         self._debug_expressions[name] = expr
+        if track_velocity:
+            self._debug_expressions_with_velocity.add(name)
+
+    @property
+    def debug_expressions_enabled(self) -> bool:
+        """
+        True if something in the behavior tree evaluates debug expressions, e.g. the debug plotter.
+        Use this to skip computations that are only needed for debug expressions.
+        """
+        return self.god_map.get_data(identifier.debug_expressions_enabled, default=False)
 
     def add_position_constraint(self,
                                 expr_current: Union[w.symbol_expr, float],
@@ -619,6 +653,25 @@ class Goal(GodMapWorshipper, ABC):
         :param weight:
         :param name:
         """
+        tip_Q_tipCurrent, tip_Q_goal = self._rotation_goal_error(frame_R_current=frame_R_current,
+                                                                 frame_R_goal=frame_R_goal,
+                                                                 current_R_frame_eval=current_R_frame_eval)
+        self.add_equality_constraint_vector(reference_velocities=[reference_velocity] * 3,
+                                            equality_bounds=tip_Q_goal,
+                                            weights=[weight] * 3,
+                                            task_expression=tip_Q_tipCurrent,
+                                            names=[f'{name}/rot/x',
+                                                   f'{name}/rot/y',
+                                                   f'{name}/rot/z'])
+
+    def _rotation_goal_error(self,
+                             frame_R_current: w.RotationMatrix,
+                             frame_R_goal: w.RotationMatrix,
+                             current_R_frame_eval: w.RotationMatrix) -> Tuple[w.Expression, w.Expression]:
+        """
+        :return: task expression and equality bounds for the x, y and z part of the quaternion that rotates the current
+                 frame into the goal.
+        """
         hack = w.RotationMatrix.from_axis_angle(w.Vector3((0, 0, 1)), 0.0001)
         frame_R_current = frame_R_current.dot(hack)  # hack to avoid singularity
         tip_Q_tipCurrent = current_R_frame_eval.dot(frame_R_current).to_quaternion()
@@ -628,13 +681,43 @@ class Goal(GodMapWorshipper, ABC):
 
         tip_Q_goal = w.if_greater_zero(-tip_Q_goal[3], -tip_Q_goal, tip_Q_goal)  # flip to get shortest path
 
-        expr = tip_Q_tipCurrent
         # w is not needed because its derivative is always 0 for identity quaternions
-        self.add_equality_constraint_vector(reference_velocities=[reference_velocity] * 3,
-                                            equality_bounds=tip_Q_goal[:3],
-                                            weights=[weight] * 3,
-                                            task_expression=expr[:3],
-                                            names=[f'{name}/rot/x',
+        return tip_Q_tipCurrent[:3], tip_Q_goal[:3]
+
+    def add_pose_goal_constraints(self,
+                                  frame_T_current: w.TransMatrix,
+                                  frame_T_goal: w.TransMatrix,
+                                  current_R_frame_eval: w.RotationMatrix,
+                                  reference_linear_velocity: w.symbol_expr_float,
+                                  reference_angular_velocity: w.symbol_expr_float,
+                                  weight: w.symbol_expr_float,
+                                  name: str = ''):
+        """
+        Does the same as add_point_goal_constraints and add_rotation_goal_constraints combined, but adds all six
+        constraints at once, such that both parts are built from the same frame_T_current.
+        :param frame_T_current: current pose
+        :param frame_T_goal: goal pose, expressed relative to the same frame as frame_T_current
+        :param current_R_frame_eval: an expression that computes the reverse of the rotation of frame_T_current.
+                                        Use self.get_fk_evaluated for this.
+        :param reference_linear_velocity: m/s
+        :param reference_angular_velocity: rad/s
+        :param weight:
+        :param name:
+        """
+        frame_P_current = frame_T_current.to_position()
+        frame_V_error = frame_T_goal.to_position() - frame_P_current
+        tip_Q_tipCurrent, tip_Q_goal = self._rotation_goal_error(frame_R_current=frame_T_current.to_rotation(),
+                                                                 frame_R_goal=frame_T_goal.to_rotation(),
+                                                                 current_R_frame_eval=current_R_frame_eval)
+        self.add_equality_constraint_vector(reference_velocities=[reference_linear_velocity] * 3
+                                                                 + [reference_angular_velocity] * 3,
+                                            equality_bounds=w.vstack([frame_V_error[:3], tip_Q_goal]),
+                                            weights=[weight] * 6,
+                                            task_expression=w.vstack([frame_P_current[:3], tip_Q_tipCurrent]),
+                                            names=[f'{name}/x',
+                                                   f'{name}/y',
+                                                   f'{name}/z',
+                                                   f'{name}/rot/x',
                                                    f'{name}/rot/y',
                                                    f'{name}/rot/z'])
 
@@ -665,6 +748,15 @@ class Goal(GodMapWorshipper, ABC):
                                      velocity_limit=max_velocity)
 
 
+def _numpy_to_list(values):
+    """
+    Converts numpy arrays to lists of Python floats in one call, numpy scalars don't mix well with casadi expressions.
+    """
+    if isinstance(values, np.ndarray):
+        return values.tolist()
+    return values
+
+
 def _prepend_prefix(prefix, d):
     new_dict = OrderedDict()
     for key, value in d.items():
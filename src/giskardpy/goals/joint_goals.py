@@ -2,6 +2,8 @@ from __future__ import division
 
 from typing import Dict, Optional, List
 
+import numpy as np
+
 from geometry_msgs.msg import PoseStamped
 
 from giskardpy import casadi_wrapper as w, identifier
@@ -9,7 +11,7 @@ from giskardpy.configs.giskard import ControlModes
 from giskardpy.exceptions import ConstraintException, ConstraintInitalizationException
 from giskardpy.goals.goal import Goal, WEIGHT_BELOW_CA, NonMotionGoal, WEIGHT_ABOVE_CA
 from giskardpy.model.joints import OmniDrive, DiffDrive, OmniDrivePR22
-from giskardpy.my_types import PrefixName
+from giskardpy.my_types import PrefixName, Derivatives
 from giskardpy.utils.math import axis_angle_from_quaternion
 
 
@@ -158,12 +160,11 @@ class JointPositionPrismatic(Goal):
     def make_constraints(self):
         current_joint = self.get_joint_position_symbol(self.joint_name)
 
-        try:
-            limit_expr = self.world.get_joint_velocity_limits(self.joint_name)[1]
-            max_velocity = w.min(self.max_velocity,
-                                 limit_expr)
-        except IndexError:
+        _, limit_expr = self.world.get_joint_velocity_limits(self.joint_name)
+        if limit_expr is None:
             max_velocity = self.max_velocity
+        else:
+            max_velocity = w.min(self.max_velocity, limit_expr)
 
         error = self.goal - current_joint
 
@@ -211,12 +212,11 @@ class JointVelocityRevolute(Goal):
     def make_constraints(self):
         current_joint = self.get_joint_position_symbol(self.joint_name)
 
-        try:
-            limit_expr = self.world.get_joint_velocity_limits(self.joint_name)[1]
-            max_velocity = w.min(self.max_velocity,
-                                 limit_expr)
-        except IndexError:
+        _, limit_expr = self.world.get_joint_velocity_limits(self.joint_name)
+        if limit_expr is None:
             max_velocity = self.max_velocity
+        else:
+            max_velocity = w.min(self.max_velocity, limit_expr)
 
         if self.hard:
             self.add_velocity_constraint(lower_velocity_limit=-max_velocity,
@@ -462,35 +462,57 @@ class AvoidJointLimits(Goal):
                  group_name: Optional[str] = None,
                  weight: float = WEIGHT_BELOW_CA):
         """
-        Calls AvoidSingleJointLimits for each joint in joint_list
+        Pushes all revolute and prismatic joints in joint_list away from their position limits,
+        like AvoidSingleJointLimits would for each of them.
         :param percentage:
-        :param joint_list: list of joints for which AvoidSingleJointLimits will be called
+        :param joint_list: list of joints, default all controlled joints of group_name or the world
         :param weight:
         """
         self.joint_list = joint_list
+        self.percentage = percentage
+        self.weight = weight
+        self.max_velocity = 100
         super().__init__()
         if joint_list is not None:
-            for joint_name in joint_list:
-                joint_name = self.world.search_for_joint_name(joint_name, group_name)
-                if self.world.is_joint_prismatic(joint_name) or self.world.is_joint_revolute(joint_name):
-                    self.add_constraints_of_goal(AvoidSingleJointLimits(joint_name=joint_name.short_name,
-                                                                        group_name=None,
-                                                                        percentage=percentage,
-                                                                        weight=weight))
+            joint_names = [self.world.search_for_joint_name(joint_name, group_name) for joint_name in joint_list]
+        elif group_name is None:
+            joint_names = self.world.controlled_joints
         else:
-            if group_name is None:
-                joint_list = self.world.controlled_joints
-            else:
-                joint_list = self.world.groups[group_name].controlled_joints
-            for joint_name in joint_list:
-                if self.world.is_joint_prismatic(joint_name) or self.world.is_joint_revolute(joint_name):
-                    self.add_constraints_of_goal(AvoidSingleJointLimits(joint_name=joint_name.short_name,
-                                                                        group_name=None,
-                                                                        percentage=percentage,
-                                                                        weight=weight))
+            joint_names = self.world.groups[group_name].controlled_joints
+        self.joint_names = tuple(joint_name for joint_name in joint_names
+                                 if self.world.is_joint_prismatic(joint_name)
+                                 or self.world.is_joint_revolute(joint_name))
 
     def make_constraints(self):
-        pass
+        if len(self.joint_names) == 0:
+            return
+        joint_names = list(self.joint_names)
+        joint_symbols = w.Expression([self.get_joint_position_symbol(j) for j in joint_names])
+        percentage = self.percentage / 100.
+        lower_limits, upper_limits = self.world.compute_joint_limits_batch(joint_names, Derivatives.position)
+        _, velocity_limits = self.world.compute_joint_limits_batch(joint_names, Derivatives.velocity)
+        max_velocities = np.minimum(self.max_velocity, velocity_limits)
+
+        joint_ranges = upper_limits - lower_limits
+        centers = (upper_limits + lower_limits) / 2.
+
+        max_errors = joint_ranges / 2. * percentage
+
+        upper_goals = centers + joint_ranges / 2. * (1 - percentage)
+        lower_goals = centers - joint_ranges / 2. * (1 - percentage)
+
+        upper_errors = w.Expression(upper_goals) - joint_symbols
+        lower_errors = w.Expression(lower_goals) - joint_symbols
+
+        errors = w.max(w.abs(w.min(upper_errors, 0)), w.abs(w.max(lower_errors, 0)))
+        weights = errors * w.Expression(self.weight / max_errors)
+
+        self.add_inequality_constraint_vector(reference_velocities=max_velocities,
+                                              lower_errors=lower_errors,
+                                              upper_errors=upper_errors,
+                                              weights=weights,
+                                              task_expression=joint_symbols,
+                                              names=[str(joint_name) for joint_name in joint_names])
 
     def __str__(self) -> str:
         return f'{super().__str__()}/{self.joint_list}'
@@ -504,30 +526,63 @@ class JointPositionList(Goal):
                  max_velocity: Optional[float] = None,
                  hard: bool = False):
         """
-        Calls JointPosition for a list of joints.
+        Moves all joints in goal_state to their goal position, like JointPosition would for each of them.
         :param goal_state: maps joint_name to goal position
         :param group_name: if joint_name is not unique, search in this group for matches.
-        :param weight:
-        :param max_velocity: will be applied to all joints, you should group joint types, e.g., prismatic joints
+        :param weight: default WEIGHT_BELOW_CA
+        :param max_velocity: will be applied to all joints, you should group joint types, e.g., prismatic joints,
+                             default 100, meaning the urdf/config limits are active
         :param hard: turns this into a hard constraint.
         """
+        if weight is None:
+            weight = WEIGHT_BELOW_CA
+        if max_velocity is None:
+            max_velocity = 100
+        self.weight = weight
+        self.max_velocity = max_velocity
+        self.hard = hard
         super().__init__()
         self.joint_names = list(goal_state.keys())
         if len(goal_state) == 0:
             raise ConstraintInitalizationException(f'Can\'t initialize {self} with no joints.')
-        for joint_name, goal_position in goal_state.items():
-            params = {'joint_name': joint_name,
-                      'group_name': group_name,
-                      'goal': goal_position}
-            if weight is not None:
-                params['weight'] = weight
-            if max_velocity is not None:
-                params['max_velocity'] = max_velocity
-            params['hard'] = hard
-            self.add_constraints_of_goal(JointPosition(**params))
+        n = len(goal_state)
+        goal_joint_names = [None] * n
+        self.goal_positions = np.empty(n, dtype=float)
+        self.continuous_mask = np.zeros(n, dtype=bool)
+        prismatic_mask = np.zeros(n, dtype=bool)
+        for i, (joint_name, goal_position) in enumerate(goal_state.items()):
+            joint_name = self.world.search_for_joint_name(joint_name, group_name)
+            is_continuous = self.world.is_joint_continuous(joint_name)
+            is_prismatic = not is_continuous and self.world.is_joint_prismatic(joint_name)
+            if not (is_continuous or is_prismatic or self.world.is_joint_revolute(joint_name)):
+                raise ConstraintInitalizationException(f'\'{joint_name}\' has to be continuous, revolute or prismatic')
+            goal_joint_names[i] = joint_name
+            self.goal_positions[i] = goal_position
+            self.continuous_mask[i] = is_continuous
+            prismatic_mask[i] = is_prismatic
+        self.goal_joint_names = tuple(goal_joint_names)
+        if np.any(prismatic_mask):
+            prismatic_joints = [j for j, prismatic in zip(self.goal_joint_names, prismatic_mask) if prismatic]
+            lower_limits, upper_limits = self.world.compute_joint_limits_batch(prismatic_joints, Derivatives.position)
+            self.goal_positions[prismatic_mask] = np.clip(self.goal_positions[prismatic_mask],
+                                                          lower_limits, upper_limits)
 
     def make_constraints(self):
-        pass
+        current_positions = w.Expression([self.get_joint_position_symbol(j) for j in self.goal_joint_names])
+        errors = w.Expression(self.goal_positions) - current_positions
+        continuous_indices = np.flatnonzero(self.continuous_mask).tolist()
+        if len(continuous_indices) > 0:
+            errors[continuous_indices] = w.normalize_angle(errors[continuous_indices])
+        _, velocity_limits = self.world.compute_joint_limits_batch(list(self.goal_joint_names), Derivatives.velocity)
+        max_velocities = np.minimum(self.max_velocity, velocity_limits)
+        slack_limits = np.zeros(len(self.goal_joint_names)) if self.hard else None
+        self.add_equality_constraint_vector(reference_velocities=max_velocities,
+                                            equality_bounds=errors,
+                                            weights=np.full(len(self.goal_joint_names), self.weight),
+                                            task_expression=current_positions,
+                                            names=[str(joint_name) for joint_name in self.goal_joint_names],
+                                            lower_slack_limits=slack_limits,
+                                            upper_slack_limits=slack_limits)
 
     def __str__(self):
         s = super().__str__()
@@ -57,9 +57,9 @@ class Pointing(Goal):
         root_V_pointing_axis = root_T_tip.dot(tip_V_pointing_axis)
         root_V_pointing_axis.vis_frame = self.tip
         root_V_goal_axis.vis_frame = self.tip
-        self.add_debug_expr('goal_point', root_P_goal_point)
-        self.add_debug_expr('root_V_pointing_axis', root_V_pointing_axis)
-        self.add_debug_expr('root_V_goal_axis', root_V_goal_axis)
+        self.add_debug_expr('goal_point', root_P_goal_point, track_velocity=False)
+        self.add_debug_expr('root_V_pointing_axis', root_V_pointing_axis, track_velocity=False)
+        self.add_debug_expr('root_V_goal_axis', root_V_goal_axis, track_velocity=False)
         self.add_vector_goal_constraints(frame_V_current=root_V_pointing_axis,
                                          frame_V_goal=root_V_goal_axis,
                                          reference_velocity=self.max_velocity,
@@ -3,7 +3,7 @@ import numbers
 from collections import defaultdict
 from copy import copy, deepcopy
 from multiprocessing import RLock
-from typing import Sequence, Union, Any, List
+from typing import Sequence, Union, Any, List, Callable
 
 import numpy as np
 from geometry_msgs.msg import Pose, Point, Vector3, PoseStamped, PointStamped, Vector3Stamped, QuaternionStamped, \
@@ -423,6 +423,24 @@ class GodMap(metaclass=SingletonMeta):
                     raise e
             raise e
 
+    def compile_value_getter(self, symbols: List[str]) -> Callable[[], np.ndarray]:
+        """
+        Generates a function that returns the same as unsafe_get_values(symbols), but the shortcuts of all symbols
+        are resolved once here, instead of looking them up by name in every call.
+        The data has to exist already.
+        """
+        shortcuts = []
+        for expr in symbols:
+            key = tuple(self.expr_to_key[expr])
+            self.unsafe_get_data(key)
+            shortcuts.append(self.shortcuts[key])
+        entries = ''.join(f's[{i}].c(d), ' for i in range(len(shortcuts)))
+        source = (f'def get_values():\n'
+                  f'    d = god_map._data\n'
+                  f'    return np.array(({entries}), dtype=float)\n')
+        namespace = {'np': np, 'god_map': self, 's': tuple(shortcuts)}
+        exec(source, namespace)
+        return namespace['get_values']
 
     def evaluate_expr(self, expr: w.Expression):
         if isinstance(expr, (int, float)):
@@ -436,6 +454,25 @@ class GodMap(metaclass=SingletonMeta):
         else:
             return result
 
+    def evaluate_exprs(self, exprs: List[Union[w.symbol_expr_float, w.Expression]]) -> np.ndarray:
+        """
+        Evaluates a list of expressions with a single compiled function.
+        Numbers are copied into the result without being compiled.
+        :return: 1d array with one entry per expression
+        """
+        result = np.zeros(len(exprs))
+        symbolic_indices = []
+        symbolic_exprs = []
+        for i, expr in enumerate(exprs):
+            if isinstance(expr, (int, float)):
+                result[i] = expr
+            else:
+                symbolic_indices.append(i)
+                symbolic_exprs.append(expr)
+        if len(symbolic_exprs) > 0:
+            result[symbolic_indices] = np.ravel(self.evaluate_expr(w.Expression(symbolic_exprs)))
+        return result
+
     def get_registered_symbols(self):
         """
         :rtype: list
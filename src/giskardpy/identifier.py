@@ -26,6 +26,8 @@ neq_constraints = ['neq_constraints']
 derivative_constraints = ['derivative_constraints']
 free_variables = ['free_variables']
 debug_expressions = ['debug_expressions']
+debug_expressions_with_velocity = ['debug_expressions_with_velocity']
+debug_expressions_enabled = ['debug_expressions_enabled']
 
 execute = ['execute']
 skip_failures = ['skip_failures']
@@ -58,6 +60,8 @@ qp_solver_name = qp_controller_config + ['qp_solver']
 prediction_horizon = qp_controller_config + ['prediction_horizon']
 retries_with_relaxed_constraints = qp_controller_config + ['retries_with_relaxed_constraints']
 retry_added_slack = qp_controller_config + ['added_slack']
+jit = qp_controller_config + ['jit']
+cse = qp_controller_config + ['cse']
 retry_weight_factor = qp_controller_config + ['weight_factor']
 
 # behavior tree
@@ -6,8 +6,6 @@ from itertools import product
 from threading import Lock
 from typing import List, Union, Dict, Tuple
 import numpy as np
-import matplotlib.colors as mcolors
-import pylab as plt
 import rospy
 from sortedcontainers import SortedDict
 from trajectory_msgs.msg import JointTrajectory, JointTrajectoryPoint
@@ -36,7 +34,7 @@ class Trajectory:
         return self._points[time]
 
     def set(self, time: int, point: JointStates):
-        if len(self._points) > 0 and list(self._points.keys())[-1] > time:
+        if len(self._points) > 0 and next(reversed(self._points)) > time:
             raise KeyError('Cannot append a trajectory point that is before the current end time of the trajectory.')
         self._points[time] = point
 
@@ -138,6 +136,8 @@ class Trajectory:
         :param normalize_position: centers the joint positions around 0 on the y axis
         :param tick_stride: the distance between ticks in the plot. if tick_stride <= 0 pyplot determines the ticks automatically
         """
+        import matplotlib.colors as mcolors
+        import pylab as plt
         cm_per_second = cm_to_inch(cm_per_second)
         height_per_derivative = cm_to_inch(height_per_derivative)
         hspace = cm_to_inch(hspace)
@@ -223,3 +223,65 @@ class Trajectory:
                         pass
             plt.savefig(file_name, bbox_inches="tight")
             logging.loginfo(f'saved {file_name}')
+
+
+class DebugTrajectory:
+    """
+    Stores debug expressions over time with one preallocated array per expression, whose first axis is the time,
+    instead of one JointStates per time step.
+    The arrays double in size, if the trajectory gets longer than expected.
+    """
+    _data: Dict[str, np.ndarray]
+    _times: np.ndarray
+
+    def __init__(self, expected_length: int = 256):
+        self._capacity = max(expected_length, 1)
+        self.clear()
+
+    def clear(self):
+        self._data = {}
+        self._times = np.zeros(self._capacity, dtype=int)
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _grow(self):
+        self._capacity *= 2
+        for name, data in self._data.items():
+            new_data = np.full((self._capacity,) + data.shape[1:], np.nan)
+            new_data[:self._length] = data[:self._length]
+            self._data[name] = new_data
+        new_times = np.zeros(self._capacity, dtype=int)
+        new_times[:self._length] = self._times[:self._length]
+        self._times = new_times
+
+    def set(self, time: int, values: Dict[str, np.ndarray]):
+        """
+        Like Trajectory.set, a point with the same time as the last one replaces it.
+        Expressions that are missing in a point are nan at that time.
+        """
+        if self._length > 0 and self._times[self._length - 1] == time:
+            row = self._length - 1
+        else:
+            if self._length > 0 and self._times[self._length - 1] > time:
+                raise KeyError('Cannot append a trajectory point that is before the current end time of the trajectory.')
+            if self._length == self._capacity:
+                self._grow()
+            row = self._length
+            self._times[row] = time
+            self._length += 1
+        for name, data in self._data.items():
+            if name not in values:
+                data[row] = np.nan
+        for name, value in values.items():
+            if name not in self._data:
+                self._data[name] = np.full((self._capacity,) + np.shape(value), np.nan)
+            self._data[name][row] = value
+
+    def times(self) -> np.ndarray:
+        return self._times[:self._length]
+
+    def items(self):
+        for name, data in self._data.items():
+            yield name, data[:self._length]
@@ -6,7 +6,7 @@ from abc import ABC
 from copy import deepcopy
 from functools import cached_property
 from itertools import combinations
-from typing import Dict, Union, Tuple, Set, Optional, List, Callable, Sequence
+from typing import Dict, Union, Tuple, Set, Optional, List, Callable, Sequence, Type
 
 import numpy as np
 import urdf_parser_py.urdf as up
@@ -156,6 +156,10 @@ class WorldTree(WorldTreeInterface, GodMapWorshipper):
     _default_limits: Dict[Derivatives, float]
     _default_weights: Dict[Derivatives, float]
     _root_link_name: PrefixName = None
+    # fk chains with more joints than this are composed as a balanced tree by default
+    balanced_fk_threshold: int = 8
+    # compile the functions that compute the fk of all links to native code
+    jit_fks: bool = False
 
     def __init__(self):
         self.default_link_color = ColorRGBA(1, 1, 1, 0.75)
@@ -215,6 +219,7 @@ class WorldTree(WorldTreeInterface, GodMapWorshipper):
         logging.logwarn(f'Deprecated warning: use \'search_for_joint_name\' instead of \'get_joint_name\'.')
         return self.search_for_joint_name(joint_name, group_name)
 
+    @memoize
     def search_for_joint_name(self, joint_name: str, group_name: Optional[str] = None) -> PrefixName:
         """
         Will search the worlds joint for one that matches joint_name. group_name is only needed if there are multiple
@@ -261,6 +266,7 @@ class WorldTree(WorldTreeInterface, GodMapWorshipper):
         logging.logwarn(f'Deprecated warning: use \'search_for_link_name\' instead of \'get_link_name\'.')
         return self.search_for_link_name(link_name, group_name)
 
+    @memoize
     def search_for_link_name(self, link_name: str, group_name: Optional[str] = None) -> PrefixName:
         """
         Like get_joint_name but for links.
@@ -338,8 +344,14 @@ class WorldTree(WorldTreeInterface, GodMapWorshipper):
         clear_memo(self.compute_split_chain)
         clear_memo(self.are_linked)
         clear_memo(self.compose_fk_expression)
+        clear_memo(self.compose_fk_evaluated_expression)
         clear_memo(self.compute_chain)
         clear_memo(self.is_link_controlled)
+        clear_memo(self.search_for_joint_name)
+        clear_memo(self.search_for_link_name)
+        clear_memo(self.compute_joint_limits)
+        clear_memo(self.is_joint_continuous)
+        clear_memo(self.get_joints_of_type)
         for free_variable in self.free_variables.values():
             free_variable.reset_cache()
 
@@ -495,9 +507,13 @@ class WorldTree(WorldTreeInterface, GodMapWorshipper):
         #     if root_link_name in group.links:
         #         group.groups[name] = new_group
         self.groups[name] = new_group
+        clear_memo(self.search_for_joint_name)
+        clear_memo(self.search_for_link_name)
 
     def deregister_group(self, name: str):
         del self.groups[name]
+        clear_memo(self.search_for_joint_name)
+        clear_memo(self.search_for_link_name)
 
     @property
     def robots(self) -> List[WorldBranch]:
@@ -1189,25 +1205,45 @@ class WorldTree(WorldTreeInterface, GodMapWorshipper):
 
     @copy_memoize
     @profile
-    def compose_fk_expression(self, root_link: PrefixName, tip_link: PrefixName) -> w.TransMatrix:
+    def compose_fk_expression(self, root_link: PrefixName, tip_link: PrefixName,
+                              balanced: Optional[bool] = None) -> w.TransMatrix:
         """
         Multiplies all transformation matrices in the chain between root_link and tip_link
         :param root_link:
         :param tip_link:
+        :param balanced: if True, the matrices are multiplied pairwise in a balanced tree, such that the depth of the
+                         expression only grows logarithmically with the length of the chain.
+                         Default is True for chains that are longer than balanced_fk_threshold.
         :return: 4x4 homogenous transformation matrix
         """
-        fk = w.TransMatrix()
         root_chain, _, tip_chain = self.compute_split_chain(root_link, tip_link, add_joints=True, add_links=False,
                                                             add_fixed_joints=True, add_non_controlled_joints=True)
-        for joint_name in root_chain:
-            a = self.joints[joint_name].parent_T_child
-            ai = a.inverse()
-            fk = fk.dot(ai)
-        for joint_name in tip_chain:
-            a = self.joints[joint_name].parent_T_child
+        transforms = [self.joints[joint_name].parent_T_child.inverse() for joint_name in root_chain]
+        transforms.extend(self.joints[joint_name].parent_T_child for joint_name in tip_chain)
+        if balanced is None:
+            balanced = len(transforms) > self.balanced_fk_threshold
+        fk = w.TransMatrix()
+        if balanced and len(transforms) > 0:
+            while len(transforms) > 1:
+                transforms = [transforms[i].dot(transforms[i + 1]) if i + 1 < len(transforms) else transforms[i]
+                              for i in range(0, len(transforms), 2)]
+            return fk.dot(transforms[0])
+        for a in transforms:
             fk = fk.dot(a)
         return fk
 
+    @copy_memoize
+    def compose_fk_evaluated_expression(self, root: PrefixName, tip: PrefixName) -> w.TransMatrix:
+        """
+        :return: 4x4 homogenous transformation matrix, whose entries are symbols that refer to the current fk.
+                 If the fk is constant, e.g. because there are only fixed joints between root and tip, it is returned
+                 directly, such that it doesn't add parameters to the qp.
+        """
+        fk = self.compose_fk_expression(root, tip)
+        if len(fk.free_symbols()) == 0:
+            return fk
+        return self.god_map.list_to_frame(identifier.fk_np + [(root, tip)])
+
     @memoize
     def compute_fk_pose(self, root: my_string, tip: my_string) -> PoseStamped:
         root = self.search_for_link_name(root)
@@ -1302,8 +1338,8 @@ class WorldTree(WorldTreeInterface, GodMapWorshipper):
                 params.update(collision_fks.free_symbols())
                 params = list(params)
                 self.str_params = [str(v) for v in params]
-                self.fast_all_fks = all_fks.compile(parameters=params)
-                self.fast_collision_fks = collision_fks.compile(parameters=params)
+                self.fast_all_fks = all_fks.compile(parameters=params, jit=self.world.jit_fks)
+                self.fast_collision_fks = collision_fks.compile(parameters=params, jit=self.world.jit_fks)
                 self.idx_start = {link_name: i * 4 for i, link_name in enumerate(self.world.link_names_as_set)}
 
             @profile
@@ -1417,6 +1453,7 @@ class WorldTree(WorldTreeInterface, GodMapWorshipper):
         result.vector = Vector3(*t_V_p[:3])
         return result
 
+    @memoize
     def compute_joint_limits(self, joint_name: PrefixName, order: Derivatives) \
             -> Tuple[Optional[w.symbol_expr_float], Optional[w.symbol_expr_float]]:
         try:
@@ -1430,6 +1467,32 @@ class WorldTree(WorldTreeInterface, GodMapWorshipper):
             upper_limit = self.god_map.evaluate_expr(upper_limit)
         return lower_limit, upper_limit
 
+    def compute_joint_limits_batch(self, joint_names: Sequence[PrefixName], order: Derivatives) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Same as compute_joint_limits for multiple joints, but all symbolic limits are evaluated with one call.
+        :return: lower limits, upper limits; missing limits are -inf and inf
+        """
+        lower_limits = np.full(len(joint_names), -np.inf)
+        upper_limits = np.full(len(joint_names), np.inf)
+        limit_exprs = []
+        limit_targets = []
+        for i, joint_name in enumerate(joint_names):
+            try:
+                limits = self.joint_limit_expr(joint_name, order)
+            except KeyError:
+                # joint has no limits for this derivative
+                continue
+            for target, limit in zip((lower_limits, upper_limits), limits):
+                if limit is None:
+                    continue
+                limit_exprs.append(limit)
+                limit_targets.append((target, i))
+        values = self.god_map.evaluate_exprs(limit_exprs)
+        for (target, i), value in zip(limit_targets, values):
+            target[i] = value
+        return lower_limits, upper_limits
+
     def get_joint_position_limits(self, joint_name: my_string) -> Tuple[Optional[float], Optional[float]]:
         """
         :return: minimum position, maximum position as float
@@ -1458,6 +1521,10 @@ class WorldTree(WorldTreeInterface, GodMapWorshipper):
                                                                        evaluated=True)
         return limits
 
+    @memoize
+    def get_joints_of_type(self, joint_type: Type[Joint]) -> Tuple[Joint, ...]:
+        return tuple(joint for joint in self.joints.values() if isinstance(joint, joint_type))
+
     def is_joint_prismatic(self, joint_name: PrefixName) -> bool:
         return isinstance(self.joints[joint_name], PrismaticJoint)
 
@@ -1481,6 +1548,7 @@ class WorldTree(WorldTreeInterface, GodMapWorshipper):
     def is_joint_revolute(self, joint_name: PrefixName) -> bool:
         return isinstance(self.joints[joint_name], RevoluteJoint) and not self.is_joint_continuous(joint_name)
 
+    @memoize
     def is_joint_continuous(self, joint_name: PrefixName) -> bool:
         joint = self.joints[joint_name]
         return isinstance(joint, RevoluteJoint) and not joint.free_variable.has_position_limits()
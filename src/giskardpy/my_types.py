@@ -1,7 +1,8 @@
 from __future__ import annotations
 import numpy as np
 from enum import IntEnum
-from typing import Union, Dict
+from functools import lru_cache
+from typing import Union, Dict, Tuple
 
 import genpy
 from geometry_msgs.msg import PoseStamped, PointStamped, Vector3Stamped, QuaternionStamped
@@ -71,11 +72,13 @@ class Derivatives(IntEnum):
     pop = 6
 
     @classmethod
-    def range(cls, start: Derivatives, stop: Derivatives, step: int = 1):
+    @lru_cache(maxsize=None)
+    def range(cls, start: Derivatives, stop: Derivatives, step: int = 1) -> Tuple[Derivatives, ...]:
         """
         Includes stop!
+        The result is cached, which is why it is an immutable tuple.
         """
-        return [item for item in cls if start <= item <= stop][::step]
+        return tuple(item for item in cls if start <= item <= stop)[::step]
 
 
 number = Union[int, float, np.number]
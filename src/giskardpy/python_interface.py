@@ -479,11 +479,7 @@ class GiskardWrapper:
         """
         constraint = Constraint()
         constraint.type = constraint_type
-        for k, v in kwargs.copy().items():
-            if v is None:
-                del kwargs[k]
-            else:
-                kwargs[k] = convert_ros_message_to_dictionary(v)
+        kwargs = {k: convert_ros_message_to_dictionary(v) for k, v in kwargs.items() if v is not None}
         kwargs = replace_prefix_name_with_str(kwargs)
         constraint.parameter_value_pair = json.dumps(kwargs)
         self.cmd_seq[-1].constraints.append(constraint)
@@ -1,15 +1,16 @@
-from collections import defaultdict
 from typing import Dict, Optional, List, Union
 import numpy as np
 import giskardpy.casadi_wrapper as w
 from giskardpy import identifier
 from giskardpy.god_map import GodMap
 from giskardpy.my_types import Derivatives, PrefixName
-from giskardpy.utils.decorators import memoize
+from giskardpy.utils.decorators import memoize, clear_memo
 
 
 class FreeVariable:
     state_identifier: List[str] = identifier.joint_states
+    # names of all methods decorated with memoize, they are cleared by reset_cache
+    _memoized_methods = ('get_lower_limit', 'get_upper_limit', 'normalized_weights')
 
     def __init__(self,
                  name: PrefixName,
@@ -27,16 +28,19 @@ class FreeVariable:
         self.default_upper_limits = upper_limits
         self.lower_limits = {}
         self.upper_limits = {}
+        # default limits combined with lower_limits/upper_limits, kept up to date by set_lower/upper_limit
+        self._resolved_lower_limits = dict(lower_limits)
+        self._resolved_upper_limits = dict(upper_limits)
         self.quadratic_weights = quadratic_weights
         assert len(self.quadratic_weights) == self.god_map.get_data(identifier.max_derivative)
         assert max(self._symbols.keys()) == len(self._symbols) - 1
 
-        self.horizon_functions = defaultdict(lambda: 0.00001)
         if horizon_functions is None:
             horizon_functions = {Derivatives.velocity: 0.1,
                                  Derivatives.acceleration: 0.1,
                                  Derivatives.jerk: 0.1}
-        self.horizon_functions.update(horizon_functions)
+        # derivatives without an entry default to 0.00001
+        self.horizon_functions = dict(horizon_functions)
 
     @property
     def order(self) -> Derivatives:
@@ -49,21 +53,16 @@ class FreeVariable:
             raise KeyError(f'Free variable {self} doesn\'t have symbol for derivative of order {derivative}')
 
     def reset_cache(self):
-        for method_name in dir(self):
-            try:
-                getattr(self, method_name).memo.clear()
-            except:
-                pass
+        for method_name in self._memoized_methods:
+            clear_memo(getattr(self, method_name))
 
     @memoize
     def get_lower_limit(self, derivative: Derivatives, default: bool = False, evaluated: bool = False) -> Union[
         w.Expression, float]:
-        if not default and derivative in self.default_lower_limits and derivative in self.lower_limits:
-            expr = w.max(self.default_lower_limits[derivative], self.lower_limits[derivative])
-        elif derivative in self.default_lower_limits:
+        if default and derivative in self.default_lower_limits:
             expr = self.default_lower_limits[derivative]
-        elif derivative in self.lower_limits:
-            expr = self.lower_limits[derivative]
+        elif derivative in self._resolved_lower_limits:
+            expr = self._resolved_lower_limits[derivative]
         else:
             raise KeyError(f'Free variable {self} doesn\'t have lower limit for derivative of order {derivative}')
         if evaluated:
@@ -72,37 +71,31 @@ class FreeVariable:
 
     def set_lower_limit(self, derivative: Derivatives, limit: Union[w.Expression, float]):
         self.lower_limits[derivative] = limit
+        if derivative in self.default_lower_limits:
+            self._resolved_lower_limits[derivative] = w.max(self.default_lower_limits[derivative], limit)
+        else:
+            self._resolved_lower_limits[derivative] = limit
 
     def set_upper_limit(self, derivative: Derivatives, limit: Union[Union[w.Symbol, float], float]):
         self.upper_limits[derivative] = limit
+        if derivative in self.default_upper_limits:
+            self._resolved_upper_limits[derivative] = w.min(self.default_upper_limits[derivative], limit)
+        else:
+            self._resolved_upper_limits[derivative] = limit
 
     @memoize
     def get_upper_limit(self, derivative: Derivatives, default: bool = False, evaluated: bool = False) \
             -> Union[Union[w.Symbol, float], float]:
-        if not default and derivative in self.default_upper_limits and derivative in self.upper_limits:
-            expr = w.min(self.default_upper_limits[derivative], self.upper_limits[derivative])
-        elif derivative in self.default_upper_limits:
+        if default and derivative in self.default_upper_limits:
             expr = self.default_upper_limits[derivative]
-        elif derivative in self.upper_limits:
-            expr = self.upper_limits[derivative]
+        elif derivative in self._resolved_upper_limits:
+            expr = self._resolved_upper_limits[derivative]
         else:
             raise KeyError(f'Free variable {self} doesn\'t have upper limit for derivative of order {derivative}')
         if evaluated:
             return self.god_map.evaluate_expr(expr)
         return expr
 
-    def get_lower_limits(self, max_derivative: Derivatives) -> Dict[Derivatives, float]:
-        lower_limits = {}
-        for derivative in Derivatives.range(Derivatives.position, max_derivative):
-            lower_limits[derivative] = self.get_lower_limit(derivative, default=False, evaluated=True)
-        return lower_limits
-
-    def get_upper_limits(self, max_derivative: Derivatives) -> Dict[Derivatives, float]:
-        upper_limits = {}
-        for derivative in Derivatives.range(Derivatives.position, max_derivative):
-            upper_limits[derivative] = self.get_upper_limit(derivative, default=False, evaluated=True)
-        return upper_limits
-
     def has_position_limits(self) -> bool:
         try:
             lower_limit = self.get_lower_limit(Derivatives.position)
@@ -111,17 +104,34 @@ class FreeVariable:
         except KeyError:
             return False
 
-    @memoize
-    @profile
     def normalized_weight(self, t: int, derivative: Derivatives, prediction_horizon: int,
                           evaluated: bool = False) -> Union[Union[w.Symbol, float], float]:
+        return self.normalized_weights(derivative, prediction_horizon, evaluated)[t]
+
+    @memoize
+    def normalized_weights(self, derivative: Derivatives, prediction_horizon: int,
+                           evaluated: bool = False, upper_limit: Optional[float] = None) \
+            -> List[Union[Union[w.Symbol, float], float]]:
+        """
+        Weights of derivative for every t in range(prediction_horizon), they increase linearly along the horizon
+        and are normalized with the upper limit, which is only looked up (and evaluated) once.
+        :param upper_limit: evaluated upper limit of derivative, if it was already computed by the caller
+        """
         weight = self.quadratic_weights[derivative]
-        start = weight * self.horizon_functions[derivative]
+        start = weight * self.horizon_functions.get(derivative, 0.00001)
+        if evaluated:
+            if upper_limit is None:
+                upper_limit = self.get_upper_limit(derivative, evaluated=True)
+            normalization = (1 / float(upper_limit)) ** 2
+        else:
+            normalization = (1 / self.get_upper_limit(derivative)) ** 2
+        if prediction_horizon == 1:
+            return [start * normalization]
         a = (weight - start) / prediction_horizon
-        weight = a * t + start
-        expr = weight * (1 / self.get_upper_limit(derivative)) ** 2
         if evaluated:
-            return self.god_map.evaluate_expr(expr)
+            weights = (a * np.arange(prediction_horizon) + start) * normalization
+            return weights.tolist()
+        return [(a * t + start) * normalization for t in range(prediction_horizon)]
 
     def __str__(self) -> str:
         return self.position_name
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 import giskardpy.casadi_wrapper as cas
 import giskardpy.utils.math as gm
@@ -64,6 +66,28 @@ def compute_projected_vel_profile(current_vel, current_acc, target_vel_profile,
 
 def b_profile(current_pos, current_vel, current_acc,
               pos_limits, vel_limits, acc_limits, jerk_limits, dt, ph, eps=0.00001):
+    """
+    The profile is built once for each combination of limits, dt and ph on placeholder symbols,
+    afterwards only current_pos, current_vel and current_acc are substituted.
+    """
+    symbols, lb_profile, ub_profile = _b_profile_template(tuple(float(x) for x in pos_limits),
+                                                          tuple(float(x) for x in vel_limits),
+                                                          tuple(float(x) for x in acc_limits),
+                                                          tuple(float(x) for x in jerk_limits),
+                                                          float(dt), int(ph), float(eps))
+    current_state = [current_pos, current_vel, current_acc]
+    return cas.substitute(lb_profile, symbols, current_state), cas.substitute(ub_profile, symbols, current_state)
+
+
+@lru_cache(maxsize=None)
+def _b_profile_template(pos_limits, vel_limits, acc_limits, jerk_limits, dt, ph, eps):
+    symbols = cas.create_symbols(['current_pos', 'current_vel', 'current_acc'])
+    lb_profile, ub_profile = _b_profile(*symbols, pos_limits, vel_limits, acc_limits, jerk_limits, dt, ph, eps)
+    return symbols, lb_profile, ub_profile
+
+
+def _b_profile(current_pos, current_vel, current_acc,
+               pos_limits, vel_limits, acc_limits, jerk_limits, dt, ph, eps):
     vel_limit = vel_limits[1]
     acc_limit = acc_limits[1]
     jerk_limit = jerk_limits[1]
@@ -4,8 +4,7 @@ import os
 from abc import ABC
 from collections import defaultdict
 from copy import deepcopy
-from typing import List, Dict, Tuple, Type, Union, Optional, DefaultDict
-import matplotlib.pyplot as plt
+from typing import List, Dict, Tuple, Type, Union, Optional, DefaultDict, Callable
 import numpy as np
 import pandas as pd
 
@@ -86,13 +85,6 @@ class ProblemDataPart(ABC):
     def number_of_free_variables(self) -> int:
         return len(self.free_variables)
 
-    def replace_hack(self, expression: Union[float, cas.Expression], new_value):
-        if not isinstance(expression, cas.Expression):
-            return expression
-        hack = GodMap().to_symbol(identifier.hack)
-        expression.s = cas.ca.substitute(expression.s, hack.s, new_value)
-        return expression
-
     def get_derivative_constraints(self, derivative: Derivatives) -> List[DerivativeInequalityConstraint]:
         return [c for c in self.derivative_constraints if c.derivative == derivative]
 
@@ -194,14 +186,20 @@ class Weights(ProblemDataPart):
     def free_variable_weights_expression(self) -> List[defaultdict]:
         params = []
         weights = defaultdict(dict)  # maps order to joints
-        for t in range(self.prediction_horizon):
-            for v in self.free_variables:
-                for derivative in Derivatives.range(Derivatives.velocity, min(v.order, self.max_derivative)):
-                    if t >= self.prediction_horizon - (self.max_derivative - derivative):
-                        continue
-                    normalized_weight = v.normalized_weight(t, derivative, self.prediction_horizon,
-                                                            evaluated=self.evaluated)
-                    weights[derivative][f't{t:03}/{v.position_name}/{derivative}'] = normalized_weight
+        variable_derivatives = [(v, derivative)
+                                for v in self.free_variables
+                                for derivative in Derivatives.range(Derivatives.velocity,
+                                                                    min(v.order, self.max_derivative))]
+        upper_limits = [None] * len(variable_derivatives)
+        if self.evaluated:
+            # evaluate the upper limits of all free variables with one function
+            upper_limits = GodMap().evaluate_exprs([v.get_upper_limit(derivative)
+                                                    for v, derivative in variable_derivatives]).tolist()
+        for (v, derivative), upper_limit in zip(variable_derivatives, upper_limits):
+            normalized_weights = v.normalized_weights(derivative, self.prediction_horizon,
+                                                      evaluated=self.evaluated, upper_limit=upper_limit)
+            for t in range(self.prediction_horizon - (self.max_derivative - derivative)):
+                weights[derivative][f't{t:03}/{v.position_name}/{derivative}'] = normalized_weights[t]
         for _, weight in sorted(weights.items()):
             params.append(weight)
         return params
@@ -317,13 +315,13 @@ class FreeVariableBounds(ProblemDataPart):
         ub: DefaultDict[Derivatives, Dict[str, cas.symbol_expr_float]] = defaultdict(dict)
         for v in self.free_variables:
             lb_, ub_ = self.velocity_limit(v)
-            for t in range(self.prediction_horizon):
-                for derivative in Derivatives.range(Derivatives.velocity, min(v.order, self.max_derivative)):
-                    if t >= self.prediction_horizon - (self.max_derivative - derivative):
-                        continue
-                    index = t + self.prediction_horizon * (derivative - 1)
-                    lb[derivative][f't{t:03}/{v.name}/{derivative}'] = lb_[index]
-                    ub[derivative][f't{t:03}/{v.name}/{derivative}'] = ub_[index]
+            for derivative in Derivatives.range(Derivatives.velocity, min(v.order, self.max_derivative)):
+                # lb_ and ub_ contain one block of prediction_horizon entries per derivative
+                offset = self.prediction_horizon * (derivative - 1)
+                for t in range(self.prediction_horizon - (self.max_derivative - derivative)):
+                    key = f't{t:03}/{v.name}/{derivative}'
+                    lb[derivative][key] = lb_[offset + t]
+                    ub[derivative][key] = ub_[offset + t]
         lb_params = []
         ub_params = []
         for derivative, name_to_bound_map in sorted(lb.items()):
@@ -652,8 +650,9 @@ class EqualityModel(ProblemDataPart):
         """
         if len(self.equality_constraints) > 0:
             model = cas.zeros(len(self.equality_constraints), self.number_of_non_slack_columns)
+            expressions = cas.Expression(self.equality_constraint_expressions())
             for derivative in Derivatives.range(Derivatives.position, self.max_derivative - 1):
-                J_eq = cas.jacobian(expressions=cas.Expression(self.equality_constraint_expressions()),
+                J_eq = cas.jacobian(expressions=expressions,
                                     symbols=self.get_free_variable_symbols(derivative)) * self.dt
                 J_hstack = cas.hstack([J_eq for _ in range(self.prediction_horizon)])
                 # set jacobian entry to 0 if control horizon shorter than prediction horizon
@@ -885,8 +884,9 @@ class InequalityModel(ProblemDataPart):
         """
         if len(self.inequality_constraints) > 0:
             model = cas.zeros(len(self.inequality_constraints), self.number_of_non_slack_columns)
+            expressions = cas.Expression(self.inequality_constraint_expressions())
             for derivative in Derivatives.range(Derivatives.position, self.max_derivative - 1):
-                J_neq = cas.jacobian(expressions=cas.Expression(self.inequality_constraint_expressions()),
+                J_neq = cas.jacobian(expressions=expressions,
                                      symbols=self.get_free_variable_symbols(derivative)) * self.dt
                 J_hstack = cas.hstack([J_neq for _ in range(self.prediction_horizon)])
                 # set jacobian entry to 0 if control horizon shorter than prediction horizon
@@ -950,8 +950,14 @@ class QPProblemBuilder(GodMapWorshipper):
     """
     Wraps around QP Solver. Builds the required matrices from constraints.
     """
-    debug_expressions: Dict[str, cas.all_expressions]
-    compiled_debug_expressions: Dict[str, cas.CompiledFunction]
+    debug_expressions: Dict[str, cas.Expression]
+    debug_expression_free_symbols: Dict[str, cas.ca.SX]
+    compiled_debug_expressions: Optional[cas.CompiledFunction]
+    debug_expression_names: List[str]
+    debug_expression_shapes: List[Tuple[int, int]]
+    debug_expression_flat_names: List[str]
+    debug_expression_param_indices: Optional[np.ndarray]
+    get_debug_expression_params: Optional[Callable[[], np.ndarray]]
     evaluated_debug_expressions: Dict[str, np.ndarray]
     inequality_constraints: List[InequalityConstraint]
     equality_constraints: List[EqualityConstraint]
@@ -975,12 +981,17 @@ class QPProblemBuilder(GodMapWorshipper):
                  debug_expressions: Dict[str, Union[cas.Symbol, float]] = None,
                  retries_with_relaxed_constraints: int = 0,
                  retry_added_slack: float = 100,
-                 retry_weight_factor: float = 100):
+                 retry_weight_factor: float = 100,
+                 jit: bool = False,
+                 cse: bool = False):
+        self.jit = jit
+        self.cse = cse
         self.free_variables = []
         self.equality_constraints = []
         self.inequality_constraints = []
         self.derivative_constraints = []
         self.debug_expressions = {}
+        self.debug_expression_free_symbols = {}
         self.prediction_horizon = prediction_horizon
         self.sample_period = sample_period
         self.retries_with_relaxed_constraints = retries_with_relaxed_constraints
@@ -988,6 +999,7 @@ class QPProblemBuilder(GodMapWorshipper):
         self.retry_weight_factor = retry_weight_factor
         self.evaluated_debug_expressions = {}
         self.xdot_full = None
+        self.substitutions = None
         if free_variables is not None:
             self.add_free_variables(free_variables)
         if inequality_constraints is not None:
@@ -1060,8 +1072,13 @@ class QPProblemBuilder(GodMapWorshipper):
                             f'to prediction horizon of {self.prediction_horizon}')
             constraint.control_horizon = self.prediction_horizon
 
-    def add_debug_expressions(self, debug_expressions: Dict[str, cas.Expression]):
-        self.debug_expressions.update(debug_expressions)
+    def add_debug_expressions(self, debug_expressions: Dict[str, Union[cas.Symbol, float]]):
+        for name, expr in debug_expressions.items():
+            if not isinstance(expr, cas.Expression):
+                expr = cas.Expression(expr)
+            self.debug_expressions[name] = expr
+            for symbol in expr.free_symbols():
+                self.debug_expression_free_symbols.setdefault(str(symbol), symbol)
 
     @profile
     def compile(self, solver_class: Type[QPSolver], default_limits: bool = False) -> QPSolver:
@@ -1089,28 +1106,63 @@ class QPProblemBuilder(GodMapWorshipper):
 
         qp_solver = solver_class(weights=weights, g=g, lb=lb, ub=ub,
                                  E=E, E_slack=E_slack, bE=bE,
-                                 A=A, A_slack=A_slack, lbA=lbA, ubA=ubA)
+                                 A=A, A_slack=A_slack, lbA=lbA, ubA=ubA,
+                                 jit=self.jit, cse=self.cse)
         logging.loginfo('Done compiling controller:')
         logging.loginfo(f'  #free variables: {weights.shape[0]}')
         logging.loginfo(f'  #equality constraints: {bE.shape[0]}')
         logging.loginfo(f'  #inequality constraints: {lbA.shape[0]}')
-        self._compile_debug_expressions()
+        self._compile_debug_expressions(qp_solver.free_symbols_str)
         return qp_solver
 
     def get_parameter_names(self):
         return self.qp_solver.free_symbols_str
 
-    def _compile_debug_expressions(self):
-        self.compiled_debug_expressions = {}
-        free_symbols = set()
-        for name, expr in self.debug_expressions.items():
-            free_symbols.update(expr.free_symbols())
-        free_symbols = list(free_symbols)
+    def _compile_debug_expressions(self, qp_parameter_names: List[str]):
+        """
+        Compiles all debug expressions into a single function, such that they can be evaluated with one call.
+        evaluated_debug_expressions holds one view per debug expression into the output buffer of that function,
+        it is updated in place by eval_debug_exprs.
+        debug_expression_flat_names contains one name per entry of that buffer, e.g. 'name|x_y' for matrices.
+        If all parameters of the debug expressions are also parameters of the qp, they are taken from the
+        substitutions of the last get_cmd call instead of resolving them again with the god map.
+        """
+        self.debug_expression_names = []
+        self.debug_expression_shapes = []
+        flat_expressions = []
         for name, expr in self.debug_expressions.items():
-            self.compiled_debug_expressions[name] = expr.compile(free_symbols)
-        num_debug_expressions = len(self.compiled_debug_expressions)
+            self.debug_expression_names.append(name)
+            self.debug_expression_shapes.append(expr.shape)
+            flat_expressions.append(expr.reshape((expr.shape[0] * expr.shape[1], 1)))
+        self.compiled_debug_expressions = None
+        self.debug_expression_param_indices = None
+        self.get_debug_expression_params = None
+        self.evaluated_debug_expressions = {}
+        self.debug_expression_flat_names = []
+        num_debug_expressions = len(self.debug_expression_names)
         if num_debug_expressions > 0:
-            logging.loginfo(f'  #debug expressions: {len(self.compiled_debug_expressions)}')
+            self.compiled_debug_expressions = cas.vstack(flat_expressions).compile(
+                parameters=list(self.debug_expression_free_symbols.values()), jit=self.jit)
+            sizes = [rows * columns for rows, columns in self.debug_expression_shapes]
+            flat_views = np.split(self.compiled_debug_expressions.out, np.cumsum(sizes)[:-1])
+            for name, (rows, columns), view in zip(self.debug_expression_names,
+                                                   self.debug_expression_shapes,
+                                                   flat_views):
+                if columns > 1:
+                    view = view.reshape((rows, columns), order='F')
+                    self.debug_expression_flat_names.extend(f'{name}|{x}_{y}'
+                                                            for y in range(columns) for x in range(rows))
+                elif rows > 1:
+                    self.debug_expression_flat_names.extend(f'{name}|{x}' for x in range(rows))
+                elif rows == 1:
+                    self.debug_expression_flat_names.append(name)
+                self.evaluated_debug_expressions[name] = view
+            qp_parameter_ids = {name: i for i, name in enumerate(qp_parameter_names)}
+            debug_parameter_names = self.compiled_debug_expressions.str_params
+            if all(name in qp_parameter_ids for name in debug_parameter_names):
+                self.debug_expression_param_indices = np.array([qp_parameter_ids[name]
+                                                                for name in debug_parameter_names], dtype=int)
+            logging.loginfo(f'  #debug expressions: {num_debug_expressions}')
 
     def save_all_pandas(self, folder_name: Optional[str] = None):
         if hasattr(self, 'p_xdot') and self.p_xdot is not None:
@@ -1142,10 +1194,17 @@ class QPProblemBuilder(GodMapWorshipper):
 
     @profile
     def eval_debug_exprs(self):
-        self.evaluated_debug_expressions = {}
-        for name, f in self.compiled_debug_expressions.items():
-            params = self.god_map.get_values(f.str_params)
-            self.evaluated_debug_expressions[name] = f.fast_call(params).copy()
+        if self.compiled_debug_expressions is None:
+            return self.evaluated_debug_expressions
+        if self.debug_expression_param_indices is not None and self.substitutions is not None:
+            params = self.substitutions[self.debug_expression_param_indices]
+        else:
+            with self.god_map:
+                if self.get_debug_expression_params is None:
+                    self.get_debug_expression_params = self.god_map.compile_value_getter(
+                        self.compiled_debug_expressions.str_params)
+                params = self.get_debug_expression_params()
+        self.compiled_debug_expressions.fast_call(params)
         return self.evaluated_debug_expressions
 
     @property
@@ -1157,6 +1216,7 @@ class QPProblemBuilder(GodMapWorshipper):
         """
         Uses substitutions for each symbol to compute the next commands for each joint.
         """
+        self.substitutions = substitutions
         try:
             self.xdot_full = self.qp_solver.solve_and_retry(substitutions=substitutions)
             # self._create_debug_pandas(self.qp_solver)
@@ -1196,6 +1256,8 @@ class QPProblemBuilder(GodMapWorshipper):
         logging.loginfo('No slack limit violation detected.')
 
     def _viz_mpc(self, joint_name):
+        import matplotlib.pyplot as plt
+
         def pad(a, desired_length):
             tmp = np.zeros(desired_length)
             tmp[:len(a)] = a
@@ -1252,16 +1314,13 @@ class QPProblemBuilder(GodMapWorshipper):
         num_eq_constr = len(self.equality_constraints)
         num_constr = num_vel_constr + num_neq_constr + num_eq_constr
 
-        p_debug = {}
-        for name, value in self.evaluated_debug_expressions.items():
-            if isinstance(value, np.ndarray):
-                if len(value.shape) == 2:
-                    p_debug[name] = value.reshape((value.shape[0] * value.shape[1]))
-                else:
-                    p_debug[name] = value
-            else:
-                p_debug[name] = np.array(value)
-        self.p_debug = pd.DataFrame.from_dict(p_debug, orient='index').sort_index()
+        debug_names = sorted(self.evaluated_debug_expressions.keys())
+        max_debug_size = max((np.size(value) for value in self.evaluated_debug_expressions.values()), default=0)
+        p_debug = np.full((len(debug_names), max_debug_size), np.nan)
+        for i, name in enumerate(debug_names):
+            value = np.ravel(self.evaluated_debug_expressions[name])
+            p_debug[i, :value.size] = value
+        self.p_debug = pd.DataFrame(p_debug, index=debug_names)
 
         self.p_weights = pd.DataFrame(weights, self.free_variable_names, ['data'], dtype=float)
         self.p_g = pd.DataFrame(g, self.free_variable_names, ['data'], dtype=float)
@@ -58,8 +58,12 @@ class QPSolver(ABC):
     @abc.abstractmethod
     def __init__(self, weights: cas.Expression, g: cas.Expression, lb: cas.Expression, ub: cas.Expression,
                  A: cas.Expression, A_slack: cas.Expression, lbA: cas.Expression, ubA: cas.Expression,
-                 E: cas.Expression, E_slack: cas.Expression, bE: cas.Expression):
-        pass
+                 E: cas.Expression, E_slack: cas.Expression, bE: cas.Expression, jit: bool = False,
+                 cse: bool = False):
+        """
+        :param jit: if True, the functions that evaluate the qp matrices are compiled to native code.
+        :param cse: if True, common subexpressions of the qp matrices are merged before compiling them.
+        """
 
     @classmethod
     def get_solver_times(self) -> dict:
@@ -89,12 +93,23 @@ class QPSolver(ABC):
 
     @staticmethod
     def to_inf_filter(casadi_array):
+        return QPSolver.to_inf_filters(casadi_array)[0]
+
+    @staticmethod
+    def to_inf_filters(*casadi_arrays: cas.Expression) -> List[np.ndarray]:
+        """
+        Computes the inf filters of all arrays with one compiled function, instead of compiling each array on its own.
+        """
         # FIXME, buggy if a function happens to evaluate with all 0 input
-        if casadi_array.shape[0] == 0:
-            return np.eye(0)
-        compiled = casadi_array.compile()
+        non_empty_arrays = [casadi_array for casadi_array in casadi_arrays if casadi_array.shape[0] > 0]
+        if len(non_empty_arrays) == 0:
+            return [np.eye(0) for _ in casadi_arrays]
+        compiled = cas.vstack(non_empty_arrays).compile()
         inf_filter = np.isfinite(compiled.fast_call(np.zeros(len(compiled.str_params))))
-        return inf_filter
+        split_indices = np.cumsum([casadi_array.shape[0] for casadi_array in non_empty_arrays])[:-1]
+        non_empty_filters = iter(np.split(inf_filter, split_indices))
+        return [next(non_empty_filters) if casadi_array.shape[0] > 0 else np.eye(0)
+                for casadi_array in casadi_arrays]
 
     @abc.abstractmethod
     def apply_filters(self):
@@ -215,7 +230,8 @@ class QPSWIFTFormatter(QPSolver):
     @profile
     def __init__(self, weights: cas.Expression, g: cas.Expression, lb: cas.Expression, ub: cas.Expression,
                  E: cas.Expression, E_slack: cas.Expression, bE: cas.Expression,
-                 A: cas.Expression, A_slack: cas.Expression, lbA: cas.Expression, ubA: cas.Expression):
+                 A: cas.Expression, A_slack: cas.Expression, lbA: cas.Expression, ubA: cas.Expression,
+                 jit: bool = False, cse: bool = False):
         """
         min_x 0.5 x^T H x + g^T x
         s.t.  Ex = b
@@ -229,13 +245,11 @@ class QPSWIFTFormatter(QPSolver):
         self.num_slack_variables = self.num_eq_slack_variables + self.num_neq_slack_variables
         self.num_non_slack_variables = self.num_free_variable_constraints - self.num_slack_variables
 
-        self.lb_inf_filter = self.to_inf_filter(lb)
-        self.ub_inf_filter = self.to_inf_filter(ub)
+        self.lb_inf_filter, self.ub_inf_filter, self.nlbA_inf_filter, self.ubA_inf_filter = \
+            self.to_inf_filters(lb, ub, lbA, ubA)
         nlb_without_inf = -lb[self.lb_inf_filter]
         ub_without_inf = ub[self.ub_inf_filter]
 
-        self.nlbA_inf_filter = self.to_inf_filter(lbA)
-        self.ubA_inf_filter = self.to_inf_filter(ubA)
         nlbA_without_inf = -lbA[self.nlbA_inf_filter]
         ubA_without_inf = ubA[self.ubA_inf_filter]
         nA_without_inf = -A[self.nlbA_inf_filter]
@@ -266,15 +280,17 @@ class QPSWIFTFormatter(QPSolver):
         free_symbols.update(nlbA_ubA.free_symbols())
         free_symbols = list(free_symbols)
 
-        self.E_f = combined_E.compile(parameters=free_symbols, sparse=self.sparse)
-        self.nA_A_f = nA_A.compile(parameters=free_symbols, sparse=self.sparse)
+        self.E_f = combined_E.compile(parameters=free_symbols, sparse=self.sparse, jit=jit, cse=cse)
+        self.nA_A_f = nA_A.compile(parameters=free_symbols, sparse=self.sparse, jit=jit, cse=cse)
         self.combined_vector_f = cas.StackedCompiledFunction([weights,
                                                               g,
                                                               nlb_without_inf,
                                                               ub_without_inf,
                                                               bE,
                                                               nlbA_ubA],
-                                                             parameters=free_symbols)
+                                                             parameters=free_symbols,
+                                                             jit=jit,
+                                                             cse=cse)
 
         self.free_symbols_str = [str(x) for x in free_symbols]
 
@@ -45,7 +45,8 @@ class QPSolverQPalm(QPSolver):
     @profile
     def __init__(self, weights: cas.Expression, g: cas.Expression, lb: cas.Expression, ub: cas.Expression,
                  E: cas.Expression, E_slack: cas.Expression, bE: cas.Expression,
-                 A: cas.Expression, A_slack: cas.Expression, lbA: cas.Expression, ubA: cas.Expression):
+                 A: cas.Expression, A_slack: cas.Expression, lbA: cas.Expression, ubA: cas.Expression,
+                 jit: bool = False, cse: bool = False):
         """
         min_x 0.5 x^T H x + g^T x
         s.t.  lb <= Ax <= ub
@@ -76,11 +77,15 @@ class QPSolverQPalm(QPSolver):
 
         self.w_lb_bE_lbA_f = cas.StackedCompiledFunction(expressions=[weights, lb, bE, lbA],
                                                          parameters=free_symbols,
-                                                         additional_views=[slice(weights.shape[0], None)])
+                                                         additional_views=[slice(weights.shape[0], None)],
+                                                         jit=jit,
+                                                         cse=cse)
         self.ub_bE_ubA_f = cas.StackedCompiledFunction(expressions=[ub, bE, ubA],
                                                        parameters=free_symbols,
-                                                       additional_views=[slice(0, None)])
-        self.A_f = combined_A.compile(parameters=free_symbols, sparse=self.sparse)
+                                                       additional_views=[slice(0, None)],
+                                                       jit=jit,
+                                                       cse=cse)
+        self.A_f = combined_A.compile(parameters=free_symbols, sparse=self.sparse, jit=jit, cse=cse)
 
         self.free_symbols_str = [str(x) for x in free_symbols]
 
@@ -4,6 +4,8 @@ from giskardpy.my_types import Derivatives
 from giskardpy.tree.behaviors.plugin import GiskardBehavior
 from giskardpy.utils.decorators import record_time
 
+_non_position_derivatives = Derivatives.range(Derivatives.velocity, max(Derivatives))
+
 
 class SetZeroVelocity(GiskardBehavior):
     @profile
@@ -15,10 +17,8 @@ class SetZeroVelocity(GiskardBehavior):
     @record_time
     @profile
     def update(self):
-        for free_variable, state in self.world.state.items():
-            for derivative in Derivatives:
-                if derivative == Derivatives.position:
-                    continue
-                self.world.state[free_variable][derivative] = 0
+        for state in self.world.state.values():
+            for derivative in _non_position_derivatives:
+                state[derivative] = 0
         self.world.notify_state_change()
         return Status.SUCCESS
@@ -76,7 +76,7 @@ class DebugMarkerPublisher(GiskardBehavior):
                 d_R_x = rotation_matrix(np.pi / 2, [0, 1, 0])
                 map_R_x = np.dot(map_T_d, d_R_x)
                 mx.pose.orientation = Quaternion(*quaternion_from_matrix(map_R_x))
-                mx.color = ColorRGBA(1, 0, 0, 1)
+                mx.color = self.colors[1]
                 mx.scale.x = width / 4
                 mx.scale.y = width / 4
                 mx.scale.z = width * 2
@@ -96,7 +96,7 @@ class DebugMarkerPublisher(GiskardBehavior):
                 d_R_y = rotation_matrix(-np.pi / 2, [1, 0, 0])
                 map_R_y = np.dot(map_T_d, d_R_y)
                 my.pose.orientation = Quaternion(*quaternion_from_matrix(map_R_y))
-                my.color = ColorRGBA(0, 1, 0, 1)
+                my.color = self.colors[2]
                 my.scale.x = width / 4
                 my.scale.y = width / 4
                 my.scale.z = width * 2
@@ -114,7 +114,7 @@ class DebugMarkerPublisher(GiskardBehavior):
                 mz.pose.position.y = map_P_d[1][0] + map_V_z_offset[1]
                 mz.pose.position.z = map_P_d[2][0] + map_V_z_offset[2]
                 mz.pose.orientation = Quaternion(*quaternion_from_matrix(map_T_d))
-                mz.color = ColorRGBA(0, 0, 1, 1)
+                mz.color = self.colors[4]
                 mz.scale.x = width / 4
                 mz.scale.y = width / 4
                 mz.scale.z = width * 2
@@ -1,9 +1,11 @@
+from typing import Dict, Tuple
+
 import numpy as np
 from py_trees import Status
 
+import giskardpy.casadi_wrapper as w
 import giskardpy.identifier as identifier
 from giskardpy.my_types import Derivatives
-from giskardpy.qp.free_variable import FreeVariable
 from giskardpy.tree.behaviors.plugin import GiskardBehavior
 from giskardpy.utils import logging
 from giskardpy.utils.decorators import record_time
@@ -19,6 +21,9 @@ class GoalReached(GiskardBehavior):
         self.window_size = window_size
         self.real_time = real_time
         self.sample_period = self.god_map.get_data(identifier.sample_period)
+        # compiled velocity limits of this behavior, reused by later goals with the same free variables
+        self.velocity_limit_functions: Dict[Tuple[str, ...], w.CompiledFunction] = {}
+        self.velocity_limit_functions_model_version = -1
         if real_time:
             self.window_size *= self.sample_period
 
@@ -36,7 +41,7 @@ class GoalReached(GiskardBehavior):
             return Status.RUNNING
         planning_time = self.god_map.get_data(identifier.time)
         if planning_time - self.above_threshold_time >= self.window_size:
-            velocities = np.array(list(self.god_map.get_data(identifier.qp_solver_solution).xdot_velocity))
+            velocities = self.god_map.get_data(identifier.qp_solver_solution).xdot_velocity
             below_threshold = np.all(np.abs(velocities) < self.thresholds)
             if below_threshold:
                 run_time = self.get_runtime()
@@ -47,12 +52,15 @@ class GoalReached(GiskardBehavior):
         return Status.RUNNING
 
     def make_velocity_threshold(self, min_cut_off=0.01, max_cut_off=0.06):
-        joint_convergence_threshold = self.joint_convergence_threshold
         free_variables = self.god_map.get_data(identifier.free_variables)
-        thresholds = []
-        for free_variable in free_variables:  # type: FreeVariable
-            velocity_limit = self.god_map.evaluate_expr(free_variable.get_upper_limit(Derivatives.velocity))
-            velocity_limit *= joint_convergence_threshold
-            velocity_limit = min(max(min_cut_off, velocity_limit), max_cut_off)
-            thresholds.append(velocity_limit)
-        return np.array(thresholds)
\ No newline at end of file
+        if self.velocity_limit_functions_model_version != self.world.model_version:
+            self.velocity_limit_functions = {}
+            self.velocity_limit_functions_model_version = self.world.model_version
+        key = tuple(free_variable.position_name for free_variable in free_variables)
+        if key not in self.velocity_limit_functions:
+            velocity_limits = w.Expression([free_variable.get_upper_limit(Derivatives.velocity)
+                                            for free_variable in free_variables])
+            self.velocity_limit_functions[key] = velocity_limits.compile()
+        f = self.velocity_limit_functions[key]
+        velocity_limits = np.array(f.fast_call(self.god_map.get_values(f.str_params)), dtype=float).reshape(-1)
+        return np.clip(velocity_limits * self.joint_convergence_threshold, min_cut_off, max_cut_off)
@@ -34,6 +34,8 @@ class InitQPController(GiskardBehavior):
                 identifier.retries_with_relaxed_constraints),
             retry_added_slack=self.god_map.unsafe_get_data(identifier.retry_added_slack),
             retry_weight_factor=self.god_map.unsafe_get_data(identifier.retry_weight_factor),
+            jit=self.god_map.unsafe_get_data(identifier.jit),
+            cse=self.god_map.unsafe_get_data(identifier.cse),
         )
         self.god_map.set_data(identifier.qp_controller, qp_controller)
 
@@ -45,6 +47,7 @@ class InitQPController(GiskardBehavior):
         neq_constraints = {}
         derivative_constraints = {}
         debug_expressions = {}
+        debug_expressions_with_velocity = set()
         goals: Dict[str, Goal] = self.god_map.get_data(identifier.goals)
         for goal_name, goal in list(goals.items()):
             try:
@@ -55,11 +58,13 @@ class InitQPController(GiskardBehavior):
             neq_constraints.update(new_neq_constraints)
             derivative_constraints.update(new_derivative_constraints)
             debug_expressions.update(_debug_expressions)
+            debug_expressions_with_velocity.update(goal._debug_expressions_with_velocity)
             # logging.loginfo(f'{goal_name} added {len(_constraints)+len(_vel_constraints)} constraints.')
         self.god_map.set_data(identifier.eq_constraints, eq_constraints)
         self.god_map.set_data(identifier.neq_constraints, neq_constraints)
         self.god_map.set_data(identifier.derivative_constraints, derivative_constraints)
         self.god_map.set_data(identifier.debug_expressions, debug_expressions)
+        self.god_map.set_data(identifier.debug_expressions_with_velocity, debug_expressions_with_velocity)
         return eq_constraints, neq_constraints, derivative_constraints, debug_expressions
 
     def get_active_free_symbols(self,
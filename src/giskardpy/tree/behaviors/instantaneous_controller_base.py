@@ -1,3 +1,6 @@
+from typing import Callable
+
+import numpy as np
 from py_trees import Status
 
 import giskardpy.identifier as identifier
@@ -8,18 +11,21 @@ from giskardpy.utils.decorators import catch_and_raise_to_blackboard, record_tim
 
 class ControllerPluginBase(GiskardBehavior):
     controller: QPProblemBuilder = None
+    get_substitutions: Callable[[], np.ndarray] = None
 
     @catch_and_raise_to_blackboard
     @profile
     def initialise(self):
         self.controller = self.god_map.get_data(identifier.qp_controller)
+        with self.god_map:
+            self.get_substitutions = self.god_map.compile_value_getter(self.controller.get_parameter_names())
 
     @catch_and_raise_to_blackboard
     @record_time
     @profile
     def update(self):
-        parameters = self.controller.get_parameter_names()
-        substitutions = self.god_map.get_values(parameters)
+        with self.god_map:
+            substitutions = self.get_substitutions()
 
         next_cmds = self.controller.get_cmd(substitutions)
         self.god_map.set_data(identifier.qp_solver_solution, next_cmds)
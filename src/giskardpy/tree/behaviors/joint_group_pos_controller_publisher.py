@@ -4,7 +4,6 @@ import rospy
 from std_msgs.msg import Float64MultiArray
 
 import giskardpy.identifier as identifier
-from giskardpy.data_types import KeyDefaultDict
 from giskardpy.my_types import Derivatives
 from giskardpy.tree.behaviors.cmd_publisher import CommandPublisher
 from giskardpy.utils.decorators import record_time
@@ -23,14 +22,6 @@ class JointGroupPosController(CommandPublisher):
             self.joint_names[i] = self.world.search_for_joint_name(self.joint_names[i])
         self.world.register_controlled_joints(self.joint_names)
 
-    @profile
-    def initialise(self):
-        def f(joint_symbol):
-            return self.god_map.expr_to_key[joint_symbol][-2]
-
-        self.symbol_to_joint_map = KeyDefaultDict(f)
-        super().initialise()
-
     def publish_joint_state(self, time):
         msg = Float64MultiArray()
         js = deepcopy(self.world.state)
@@ -7,7 +7,7 @@ from std_msgs.msg import Float64MultiArray
 from sensor_msgs.msg import JointState
 
 import giskardpy.identifier as identifier
-from giskardpy.data_types import KeyDefaultDict, JointStates
+from giskardpy.data_types import JointStates
 from giskardpy.my_types import Derivatives
 from giskardpy.tree.behaviors.cmd_publisher import CommandPublisher
 from giskardpy.tree.behaviors.plugin import GiskardBehavior
@@ -27,14 +27,6 @@ class JointGroupVelController(GiskardBehavior):
         self.world.register_controlled_joints(self.joint_names)
         self.msg = None
 
-    @profile
-    def initialise(self):
-        def f(joint_symbol):
-            return self.god_map.expr_to_key[joint_symbol][-2]
-
-        self.symbol_to_joint_map = KeyDefaultDict(f)
-        super().initialise()
-
     @catch_and_raise_to_blackboard
     @record_time
     @profile
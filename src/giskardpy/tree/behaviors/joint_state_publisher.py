@@ -14,6 +14,8 @@ class JointStatePublisher(CommandPublisher):
         self.cmd_topic = f'{self.namespace}/command'
         self.cmd_pub = rospy.Publisher(self.cmd_topic, JointState, queue_size=10)
         self.joint_names = rospy.get_param('{}/controlled_joints'.format(self.namespace))
+        self.position_keys = [tuple(identifier.joint_states + [joint_name, 'position'])
+                              for joint_name in self.joint_names]
         super().__init__(name, hz)
 
     def publish_joint_state(self, time):
@@ -23,10 +25,10 @@ class JointStatePublisher(CommandPublisher):
             qp_data = self.god_map.get_data(identifier.qp_solver_solution)
         except Exception:
             return
-        for joint_name in self.joint_names:
+        for joint_name, position_key in zip(self.joint_names, self.position_keys):
             msg.name.append(joint_name)
             try:
-                key = str(self.god_map.key_to_expr[tuple(identifier.joint_states + [joint_name, 'position'])])
+                key = str(self.god_map.key_to_expr[position_key])
                 dt = ((time.current_real - self.stamp).to_sec())# - 1/self.hz)
                 # if joint_name == 'neck_shoulder_pan_joint':
                 #     print(dt)
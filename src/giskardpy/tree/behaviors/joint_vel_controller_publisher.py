@@ -6,7 +6,6 @@ from rospy.timer import TimerEvent
 from std_msgs.msg import Float64MultiArray, Float64
 
 import giskardpy.identifier as identifier
-from giskardpy.data_types import KeyDefaultDict
 from giskardpy.my_types import Derivatives
 from giskardpy.tree.behaviors.cmd_publisher import CommandPublisher
 from giskardpy.tree.behaviors.plugin import GiskardBehavior
@@ -33,14 +32,6 @@ class JointVelController(GiskardBehavior):
             self.joint_names[i] = self.world.search_for_joint_name(self.joint_names[i])
         self.world.register_controlled_joints(self.joint_names)
 
-    @profile
-    def initialise(self):
-        def f(joint_symbol):
-            return self.god_map.expr_to_key[joint_symbol][-2]
-
-        self.symbol_to_joint_map = KeyDefaultDict(f)
-        super().initialise()
-
     @catch_and_raise_to_blackboard
     @record_time
     @profile
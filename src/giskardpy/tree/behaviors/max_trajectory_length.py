@@ -15,22 +15,21 @@ class MaxTrajectoryLength(GiskardBehavior):
 
     @profile
     def initialise(self):
+        # these don't change while a goal is processed, no need to look them up on every tick
         self.endless_mode = self.god_map.get_data(identifier.endless_mode)
+        self.length = self.god_map.get_data(identifier.max_trajectory_length)
+        if not self.real_time:
+            self.sample_period = self.god_map.get_data(identifier.sample_period)
+        else:
+            self.sample_period = 1
 
     @record_time
     @profile
     def update(self):
         if self.endless_mode:
             return Status.RUNNING
-        t = self.god_map.get_data(identifier.time)
-        length = self.god_map.get_data(identifier.max_trajectory_length)
-        if not self.real_time:
-            sample_period = self.god_map.get_data(identifier.sample_period)
-            length = self.god_map.get_data(identifier.max_trajectory_length)
-        else:
-            sample_period = 1
-        t = t * sample_period
-        if t > length:
-            raise PlanningException(f'Aborted because trajectory is longer than {length}')
+        t = self.god_map.get_data(identifier.time) * self.sample_period
+        if t > self.length:
+            raise PlanningException(f'Aborted because trajectory is longer than {self.length}')
 
         return Status.RUNNING
@@ -3,7 +3,7 @@ from copy import deepcopy
 from py_trees import Status
 
 from giskardpy import identifier
-from giskardpy.model.trajectory import Trajectory
+from giskardpy.model.trajectory import Trajectory, DebugTrajectory
 from giskardpy.tree.behaviors.plugin import GiskardBehavior
 from giskardpy.utils.decorators import record_time
 
@@ -16,8 +16,13 @@ class NewTrajectory(GiskardBehavior):
         trajectory = Trajectory()
         trajectory.set(0, current_js)
         self.god_map.set_data(identifier.trajectory, trajectory)
-        trajectory = Trajectory()
-        self.god_map.set_data(identifier.debug_trajectory, trajectory)
+        max_trajectory_length = self.god_map.get_data(identifier.max_trajectory_length)
+        if max_trajectory_length is None:
+            debug_trajectory = DebugTrajectory()
+        else:
+            sample_period = self.god_map.get_data(identifier.sample_period)
+            debug_trajectory = DebugTrajectory(int(max_trajectory_length / sample_period) + 1)
+        self.god_map.set_data(identifier.debug_trajectory, debug_trajectory)
 
     def update(self):
         return Status.SUCCESS
@@ -1,15 +1,16 @@
 import traceback
 from collections import defaultdict
 from threading import Lock
-from typing import Dict
+from typing import Dict, Optional, Set
 import re
 import numpy as np
 
 from giskardpy import identifier
 from giskardpy.data_types import JointStates
-from giskardpy.model.trajectory import Trajectory
+from giskardpy.model.trajectory import Trajectory, DebugTrajectory
 from giskardpy.tree.behaviors.plot_trajectory import PlotTrajectory
 from giskardpy.utils.logging import logwarn
+from giskardpy.utils.math import finite_difference_velocities
 from giskardpy.utils.utils import create_path
 
 plot_lock = Lock()
@@ -25,34 +26,51 @@ class PlotDebugExpressions(PlotTrajectory):
         # self.path_to_data_folder += 'debug_expressions/'
         # create_path(self.path_to_data_folder)
 
-    def split_traj(self, traj) -> Trajectory:
+    def split_traj(self, traj: DebugTrajectory, sample_period: float,
+                   names_with_velocity: Optional[Set[str]] = None) -> Trajectory:
+        """
+        Splits multidimensional debug expressions into one entry per element.
+        Velocities are only computed for expressions in names_with_velocity, all others get nan velocities,
+        such that they are not plotted.
+        """
         new_traj = Trajectory()
-        for time, js in traj.items():
-            new_js = JointStates()
-            for name, js_ in js.items():
-                if isinstance(js_.position, np.ndarray):
-                    if len(js_.position.shape) == 1:
-                        for x in range(js_.position.shape[0]):
-                            tmp_name = f'{name}|{x}'
-                            new_js[tmp_name].position = js_.position[x]
-                            new_js[tmp_name].velocity = js_.velocity[x]
+        if len(traj) == 0:
+            return new_traj
+        if names_with_velocity is None:
+            names_with_velocity = set()
+        columns = {}
+        for name, positions in traj.items():
+            if name in names_with_velocity:
+                velocities = finite_difference_velocities(positions, sample_period)
+            else:
+                velocities = None
+            if positions.ndim == 1:
+                columns[name] = (positions, velocities)
+            else:
+                for index in np.ndindex(positions.shape[1:]):
+                    tmp_name = f'{name}|{"_".join(str(x) for x in index)}'
+                    column_index = (slice(None),) + index
+                    if velocities is None:
+                        columns[tmp_name] = (positions[column_index], None)
                     else:
-                        for x in range(js_.position.shape[0]):
-                            for y in range(js_.position.shape[1]):
-                                tmp_name = f'{name}|{x}_{y}'
-                                new_js[tmp_name].position = js_.position[x, y]
-                                new_js[tmp_name].velocity = js_.velocity[x, y]
+                        columns[tmp_name] = (positions[column_index], velocities[column_index])
+        for i, time in enumerate(traj.times()):
+            new_js = JointStates()
+            for name, (positions, velocities) in columns.items():
+                new_js[name].position = positions[i]
+                if velocities is None:
+                    new_js[name].velocity = np.nan
                 else:
-                    new_js[name] = js_
-                new_traj.set(time, new_js)
-
+                    new_js[name].velocity = velocities[i]
+            new_traj.set(int(time), new_js)
         return new_traj
 
     def plot(self):
         trajectory = self.god_map.get_data(identifier.debug_trajectory)
-        if trajectory and len(trajectory.items()) > 0:
+        if trajectory is not None and len(trajectory) > 0:
             sample_period = self.god_map.get_data(identifier.sample_period)
-            traj = self.split_traj(trajectory)
+            names_with_velocity = self.god_map.get_data(identifier.debug_expressions_with_velocity, default=set())
+            traj = self.split_traj(trajectory, sample_period, names_with_velocity)
             try:
                 traj.plot_trajectory(path_to_data_folder=self.path_to_data_folder,
                                      sample_period=sample_period,
@@ -47,27 +47,9 @@ class PublishDebugExpressions(GiskardBehavior):
         equality_constr_names = qp_controller.equality_bounds.names[bE_filter]
         inequality_constr_names = qp_controller.inequality_bounds.names[bA_filter]
 
-        if self.publish_debug:
-            for name, value in qp_controller.evaluated_debug_expressions.items():
-                if isinstance(value, np.ndarray):
-                    if len(value) > 1:
-                        if len(value.shape) == 2:
-                            for x in range(value.shape[0]):
-                                for y in range(value.shape[1]):
-                                    tmp_name = f'{name}|{x}_{y}'
-                                    msg.name.append(tmp_name)
-                                    msg.position.append(value[x, y])
-                        else:
-                            for x in range(value.shape[0]):
-                                    tmp_name = f'{name}|{x}'
-                                    msg.name.append(tmp_name)
-                                    msg.position.append(value[x])
-                    else:
-                        msg.name.append(name)
-                        msg.position.append(value.flatten())
-                else:
-                    msg.name.append(name)
-                    msg.position.append(value)
+        if self.publish_debug and qp_controller.compiled_debug_expressions is not None:
+            msg.name.extend(qp_controller.debug_expression_flat_names)
+            msg.position.extend(qp_controller.compiled_debug_expressions.out.tolist())
 
         if self.publish_lb:
             names = [f'lb/{entry_name}' for entry_name in free_variable_names]
@@ -10,11 +10,11 @@ class PublishFeedback(ActionServerBehavior):
     def __init__(self, name, as_name, feedback):
         super().__init__(name, as_name)
         self.feedback = feedback
+        self.feedback_msg = MoveFeedback()
+        self.feedback_msg.state = self.feedback
 
     @record_time
     @profile
     def update(self):
-        feedback_msg = MoveFeedback()
-        feedback_msg.state = self.feedback
-        self.as_handler.send_feedback(feedback_msg)
+        self.as_handler.send_feedback(self.feedback_msg)
         return Status.SUCCESS
\ No newline at end of file
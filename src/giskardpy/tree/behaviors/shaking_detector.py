@@ -1,4 +1,3 @@
-import matplotlib.pyplot as plt
 import numpy as np
 from py_trees import Status
 
@@ -26,13 +25,9 @@ class WiggleCancel(GiskardBehavior):
     def make_velocity_threshold(self, min_cut_off=0.01, max_cut_off=0.06):
         joint_convergence_threshold = self.god_map.get_data(identifier.joint_convergence_threshold)
         free_variables = self.god_map.get_data(identifier.free_variables)
-        thresholds = []
-        for free_variable in free_variables:  # type: FreeVariable
-            velocity_limit = self.god_map.evaluate_expr(free_variable.get_upper_limit(1))
-            velocity_limit *= joint_convergence_threshold
-            velocity_limit = min(max(min_cut_off, velocity_limit), max_cut_off)
-            thresholds.append(velocity_limit)
-        return np.array(thresholds)
+        velocity_limits = self.god_map.evaluate_exprs([free_variable.get_upper_limit(1)
+                                                       for free_variable in free_variables])
+        return np.clip(velocity_limits * joint_convergence_threshold, min_cut_off, max_cut_off)
 
     @record_time
     @profile
@@ -128,6 +123,7 @@ class WiggleCancel(GiskardBehavior):
         fft = np.fft.rfft(joints_filtered, axis=1)
         fft = [2.0 * np.abs(i)/N for i in fft]
         if plot:
+            import matplotlib.pyplot as plt
             y = joints_filtered
 
             x = np.linspace(0, N * sample_period, N)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
+from functools import lru_cache
 from typing import Type, TypeVar, Union, Dict, List, Optional, Any
 
 import inspect
@@ -84,31 +85,36 @@ from giskardpy.tree.composites.async_composite import AsyncBehavior
 from giskardpy.tree.composites.better_parallel import ParallelPolicy, Parallel
 from giskardpy.utils import logging
 from giskardpy.utils.utils import create_path
-from giskardpy.utils.utils import get_all_classes_in_package
 
 T = TypeVar('T', bound=Union[Type[GiskardBehavior], Type[Composite]])
 
 
+@lru_cache(maxsize=None)
 def running_is_success(cls: T) -> T:
     return py_trees.meta.running_is_success(cls)
 
 
+@lru_cache(maxsize=None)
 def success_is_failure(cls: T) -> T:
     return py_trees.meta.success_is_failure(cls)
 
 
+@lru_cache(maxsize=None)
 def failure_is_success(cls: T) -> T:
     return py_trees.meta.failure_is_success(cls)
 
 
+@lru_cache(maxsize=None)
 def running_is_failure(cls: T) -> T:
     return py_trees.meta.running_is_failure(cls)
 
 
+@lru_cache(maxsize=None)
 def failure_is_running(cls: T) -> T:
     return py_trees.meta.failure_is_running(cls)
 
 
+@lru_cache(maxsize=None)
 def success_is_running(cls: T) -> T:
     return py_trees.meta.success_is_running(cls)
 
@@ -812,6 +818,7 @@ class StandAlone(TreeManager):
         return False
 
     def add_evaluate_debug_expressions(self):
+        self.god_map.set_data(identifier.debug_expressions_enabled, True)
         nodes = self.get_nodes_of_type(EvaluateDebugExpressions)
         if len(nodes) == 0:
             self.insert_node_behind_every_node_of_type(ControllerPlugin,
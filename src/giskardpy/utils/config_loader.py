@@ -221,12 +221,10 @@ def ros_load_robot_config(config_file, old_data=None, test=False):
 
 
 def upload_config_file_to_paramserver():
-    old_params = rospy.get_param('~')
-    if rospy.has_param('~test'):
-        test = rospy.get_param('~test')
-    else:
-        test = False
-    config_file_name = rospy.get_param('~{}'.format('config'))
+    # one request for the whole private namespace, instead of one per parameter
+    old_params = rospy.get_param('~', {})
+    test = old_params.get('test', False)
+    config_file_name = old_params['config']
     ros_load_robot_config(config_file_name, old_data=old_params, test=test)
 
 
@@ -8,6 +8,12 @@ from giskardpy.my_types import Derivatives
 from giskardpy.qp.qp_solver import QPSolver
 from giskardpy.qp.qp_solver_qpalm import QPSolverQPalm
 
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda function: function
+
 
 def qv_mult(quaternion, vector):
     """
@@ -140,8 +146,10 @@ def gauss(n: float) -> float:
 
 
 def max_velocity_from_horizon_and_jerk(prediction_horizon, jerk_limit, sample_period):
+    """
+    jerk_limit may also be a np.ndarray, to check the limits of many joints at once.
+    """
     n2 = int((prediction_horizon) / 2)
-    (prediction_horizon ** 2 + prediction_horizon) / 2
     return (gauss(n2) + gauss(n2 - 1)) * jerk_limit * sample_period ** 2
 
 
@@ -388,3 +396,17 @@ def point_to_caster_angles(px, py):
     # print(f'br {point_to_single_caster_angle(px, py, center_P_br, forward_velocity)}')
     center = np.array([0, 0, 0, 1])
     print(f'center {point_to_single_caster_angle(px, py, center, forward_velocity)}')
+
+
+@njit(cache=True)
+def finite_difference_velocities(positions: np.ndarray, sample_period: float) -> np.ndarray:
+    """
+    :param positions: positions stacked over time along the first axis
+    :return: velocities with the same shape as positions, the first entry is 0
+    """
+    velocities = np.empty_like(positions)
+    if len(positions) == 0:
+        return velocities
+    velocities[0] = 0
+    velocities[1:] = (positions[1:] - positions[:-1]) / sample_period
+    return velocities
@@ -12,7 +12,7 @@ import pkgutil
 import sys
 from collections import OrderedDict
 from contextlib import contextmanager
-from functools import cached_property
+from functools import cached_property, lru_cache
 from typing import Type, Optional, Dict, Any
 
 import numpy as np
@@ -76,6 +76,14 @@ def get_all_classes_in_package(package_name: str, parent_class: Optional[Type] =
     :param parent_class: e.g. Goal
     :return:
     """
+    return dict(_get_all_classes_in_package(package_name, parent_class, silent))
+
+
+@lru_cache(maxsize=None)
+def _get_all_classes_in_package(package_name: str, parent_class: Optional[Type], silent: bool) -> Dict[str, Type]:
+    """
+    The content of a package doesn't change at runtime, so every package is only imported and searched once.
+    """
     classes = {}
     package = __import__(package_name, fromlist="dummy")
     for importer, modname, ispkg in pkgutil.iter_modules(package.__path__):
@@ -128,6 +128,13 @@ class TestExpression(unittest.TestCase):
         r1 = w.compile_and_execute(lambda a, b: w.Expression(a) - w.Expression(b), [f1, f2])
         self.assertAlmostEqual(r1, expected)
 
+    def test_compile_jit(self):
+        a = w.Symbol('a')
+        b = w.Symbol('b')
+        e = w.Expression([a * b, a - b])
+        f = e.compile([a, b], jit=True)
+        np.testing.assert_array_almost_equal(f.fast_call(np.array([2., 3.])), [6, -1])
+
     def test_len(self):
         m = w.Expression(np.eye(4))
         assert (len(m) == len(np.eye(4)))
@@ -1134,6 +1141,14 @@ class TestCASWrapper(unittest.TestCase):
         a = w.Symbol('a')
         assert w.equivalent(a, w.free_symbols(a)[0])
 
+    def test_substitute(self):
+        a, b, c = w.var('a b c')
+        m = w.Expression([a + b, a * b])
+        m2 = w.substitute(m, [a, b], [c, 2])
+        assert w.equivalent(m2[0], c + 2)
+        assert w.equivalent(m2[1], c * 2)
+        assert w.equivalent(m[0], a + b)
+
     def test_jacobian(self):
         a = w.Symbol('a')
         b = w.Symbol('b')
@@ -351,6 +351,18 @@ class TestGodMap(unittest.TestCase):
             gm.to_symbol([key])
         self.assertEqual(len(gm.get_values(keys)), len(keys))
 
+    def test_compile_value_getter(self):
+        gm = GodMap()
+        gm.clear()
+        gm.set_data(['muh'], {'a': [1, 2]})
+        gm.set_data(['kap'], 3)
+        symbols = [str(gm.to_symbol(['muh', 'a', 1])), str(gm.to_symbol(['kap'])), str(gm.to_symbol(['muh', 'a', 0]))]
+        get_values = gm.compile_value_getter(symbols)
+        np.testing.assert_array_equal(get_values(), gm.get_values(symbols))
+        gm.set_data(['muh', 'a'], [4, 5])
+        gm.set_data(['kap'], 6)
+        np.testing.assert_array_equal(get_values(), [5, 6, 4])
+
     def test_to_expr_ndarray(self):
         gm = GodMap()
         gm.clear()
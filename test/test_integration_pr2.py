@@ -749,14 +749,15 @@ class TestConstraints:
                                 weight=WEIGHT_BELOW_CA)
         zero_pose.plan_and_execute()
 
-        for time, state in zero_pose.god_map.get_data(identifier.debug_trajectory).items():
-            key = '{}/{}/{}/{}/trans_error'.format('CartesianVelocityLimit',
-                                                   'TranslationVelocityLimit',
-                                                   zero_pose.default_root,
-                                                   'base_footprint')
-            assert key in state
-            assert state[key].position <= base_linear_velocity + 2e3
-            assert state[key].position >= -base_linear_velocity - 2e3
+        debug_trajectory = dict(zero_pose.god_map.get_data(identifier.debug_trajectory).items())
+        key = '{}/{}/{}/{}/trans_error'.format('CartesianVelocityLimit',
+                                               'TranslationVelocityLimit',
+                                               zero_pose.default_root,
+                                               'base_footprint')
+        assert key in debug_trajectory
+        assert len(debug_trajectory[key]) > 0
+        assert np.all(debug_trajectory[key] <= base_linear_velocity + 2e3)
+        assert np.all(debug_trajectory[key] >= -base_linear_velocity - 2e3)
 
     def test_AvoidJointLimits1(self, zero_pose: PR2TestWrapper):
         percentage = 10
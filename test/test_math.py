@@ -34,3 +34,13 @@ class TestMath(unittest.TestCase):
         actual = giskard_math.mpc_velocity_integral(limits, 0.05, 9)
         expected = giskard_math.mpc_velocity_integral2(limits, 0.05, 9)
         self.assertAlmostEqual(actual, expected)
+
+    def test_finite_difference_velocities(self):
+        positions = np.array([[0., 1.], [1., 1.], [3., 0.]])
+        actual = giskard_math.finite_difference_velocities(positions, 0.5)
+        expected = np.array([[0., 0.], [2., 0.], [4., -2.]])
+        np.testing.assert_array_almost_equal(actual, expected)
+
+    def test_finite_difference_velocities_empty(self):
+        actual = giskard_math.finite_difference_velocities(np.empty((0, 2)), 0.5)
+        assert actual.shape == (0, 2)
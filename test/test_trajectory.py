@@ -0,0 +1,29 @@
+import unittest
+import numpy as np
+from giskardpy.model.trajectory import DebugTrajectory
+
+
+class TestDebugTrajectory(unittest.TestCase):
+    def test_set_same_time_overwrites(self):
+        trajectory = DebugTrajectory(expected_length=2)
+        trajectory.set(0, {'a': 1.})
+        trajectory.set(1, {'a': 2.})
+        trajectory.set(1, {'a': 3.})
+        assert len(trajectory) == 2
+        np.testing.assert_array_equal(trajectory.times(), [0, 1])
+        np.testing.assert_array_equal(dict(trajectory.items())['a'], [1., 3.])
+
+    def test_new_name_is_back_filled_with_nan(self):
+        trajectory = DebugTrajectory(expected_length=2)
+        trajectory.set(0, {'a': 1.})
+        trajectory.set(1, {'a': 2., 'b': np.array([1., 2.])})
+        trajectory.set(2, {'a': 3.})
+        data = dict(trajectory.items())
+        np.testing.assert_array_equal(data['a'], [1., 2., 3.])
+        np.testing.assert_array_equal(data['b'], [[np.nan, np.nan], [1., 2.], [np.nan, np.nan]])
+
+    def test_set_before_end_raises(self):
+        trajectory = DebugTrajectory()
+        trajectory.set(1, {'a': 1.})
+        with self.assertRaises(KeyError):
+            trajectory.set(0, {'a': 2.})